@@ -30,6 +30,22 @@ def safe_prefix_from_path(path):
     return f"{prefix}-{h}"
 
 
+def copy_result_file(src_file, target_dir, shard_prefix):
+    fn = os.path.basename(src_file)
+    dest_file = os.path.join(target_dir, fn)
+
+    if not os.path.exists(dest_file):
+        # simple copy if not exists
+        shutil.copy2(src_file, dest_file)
+    else:
+        # collision: copy with shard prefix to avoid overwriting
+        name, ext = os.path.splitext(fn)
+        new_name = f"{shard_prefix}--{name}{ext}"
+        new_dest = os.path.join(target_dir, new_name)
+        print(f"File name collision for {fn} -> saving as {new_name}")
+        shutil.copy2(src_file, new_dest)
+
+
 def merge_allure_results():
     if not os.path.isdir(ARTIFACTS_ROOT):
         print(f"No artifacts directory found at '{ARTIFACTS_ROOT}'. Nothing to merge.")
@@ -54,19 +70,7 @@ def merge_allure_results():
                     os.makedirs(target_dir, exist_ok=True)
 
                     for fn in filenames:
-                        src_file = os.path.join(subroot, fn)
-                        dest_file = os.path.join(target_dir, fn)
-
-                        if not os.path.exists(dest_file):
-                            # simple copy if not exists
-                            shutil.copy2(src_file, dest_file)
-                        else:
-                            # collision: copy with shard prefix to avoid overwriting
-                            name, ext = os.path.splitext(fn)
-                            new_name = f"{shard_prefix}--{name}{ext}"
-                            new_dest = os.path.join(target_dir, new_name)
-                            print(f"File name collision for {fn} -> saving as {new_name}")
-                            shutil.copy2(src_file, new_dest)
+                        copy_result_file(os.path.join(subroot, fn), target_dir, shard_prefix)
 
                 merged_any = True
 
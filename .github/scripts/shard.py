@@ -11,6 +11,9 @@ Behavior:
      GROUP_BY=class   -> group by module::Class
      GROUP_BY=none    -> no grouping (flat modulo)
  - Parent nodeids (module/class) removed if child nodeids exist.
+ - BROWSER may be a comma-separated list (e.g. chrome,firefox). Collection then yields one
+   nodeid per browser×test pair and groups are split per browser, so pairs are balanced
+   across shards instead of keeping every browser of a module on the same shard.
  - No baked-in default test config; workflow should set envs.
  - Set SHARD_DEBUG=1 to print collected nodeids and grouping info.
 """
@@ -47,6 +50,10 @@ def looks_like_nodeid(line: str) -> bool:
 
 def collect_pytest_nodeids(marker_filter: Optional[str] = None) -> List[str]:
     cmd = ["pytest", "--collect-only", "-q"]
+    browser = os.environ.get("BROWSER", "").strip()
+    if browser:
+        # must match the run command so parametrized nodeids line up
+        cmd += ["--browser", browser]
     if marker_filter:
         cmd += ["-m", marker_filter]
     try:
@@ -76,11 +83,24 @@ def remove_parent_nodeids(nodeids: Iterable[str]) -> List[str]:
     return filtered
 
 
-def group_nodeids(nodeids: List[str], by: str) -> List[List[str]]:
+def browser_of_nodeid(nodeid: str, browsers: Iterable[str]) -> Optional[str]:
+    """Return the browser parameter of a nodeid such as 'tests/x.py::T::test[firefox]', if any."""
+    m = re.search(r"\[(.*)\]$", nodeid)
+    if not m:
+        return None
+    for part in m.group(1).split("-"):
+        if part in browsers:
+            return part
+    return None
+
+
+def group_nodeids(nodeids: List[str], by: str, browsers: Iterable[str] = ()) -> List[List[str]]:
     """
     Group nodeids by 'module' (file), 'class' (module::Class), or 'none'.
+    With several browsers, each group is further split per browser.
     Returns list of groups (each group is a list of nodeids), preserving discovery order.
     """
+    browsers = set(browsers)
     groups = OrderedDict()
     for nid in nodeids:
         parts = nid.split("::")
@@ -93,10 +113,51 @@ def group_nodeids(nodeids: List[str], by: str) -> List[List[str]]:
         else:  # "none"
             # Use the full nodeid as key so every nodeid is its own group
             key = nid
+        browser = browser_of_nodeid(nid, browsers) if len(browsers) > 1 else None
+        if browser:
+            key = f"{key}[{browser}]"
         groups.setdefault(key, []).append(nid)
     return list(groups.values())
 
 
+def assign_groups_balanced(groups: List[List[str]], shard_count: int, browsers: Iterable[str]) -> List[List[str]]:
+    """
+    Greedy assignment used for multi-browser runs: each group goes to the shard with the
+    fewest tests so far, ties broken by the fewest tests of that group's browser, so both
+    test counts and browsers are spread evenly. Deterministic, so every shard agrees.
+    """
+    browsers = set(browsers)
+    shards: List[List[str]] = [[] for _ in range(shard_count)]
+    per_browser = [dict() for _ in range(shard_count)]
+    order = sorted(range(len(groups)), key=lambda gi: -len(groups[gi]))
+    for gi in order:
+        group = groups[gi]
+        browser = browser_of_nodeid(group[0], browsers)
+        target = min(range(shard_count),
+                     key=lambda si: (len(shards[si]), per_browser[si].get(browser, 0), si))
+        shards[target].extend(group)
+        per_browser[target][browser] = per_browser[target].get(browser, 0) + len(group)
+    return shards
+
+
+def interleave_by_browser(nodeids: List[str], browsers: Iterable[str]) -> List[str]:
+    """
+    Reorder nodeids round-robin across browsers (chrome, firefox, chrome, ...). pytest runs
+    explicit nodeids in the order given, so xdist workers get mixed-browser batches.
+    """
+    browsers = set(browsers)
+    buckets = OrderedDict()
+    for nid in nodeids:
+        buckets.setdefault(browser_of_nodeid(nid, browsers), []).append(nid)
+    queues = list(buckets.values())
+    interleaved: List[str] = []
+    while queues:
+        for q in queues:
+            interleaved.append(q.pop(0))
+        queues = [q for q in queues if q]
+    return interleaved
+
+
 def build_pytest_cmd(shard_tests: List[str], *, is_group_shard: bool, group_workers: Optional[str]) -> List[str]:
     cmd: List[str] = ["pytest", "-q"]
 
@@ -221,15 +282,20 @@ def main() -> None:
             shard_tests = [t for i, t in enumerate(filtered_nodeids) if i % sc == si]
         else:
             # group by module or class, then round-robin assign groups
-            groups = group_nodeids(filtered_nodeids, by=group_by)
+            browsers = [b.strip().lower() for b in os.environ.get("BROWSER", "").split(",") if b.strip()]
+            groups = group_nodeids(filtered_nodeids, by=group_by, browsers=browsers)
             if os.environ.get("SHARD_DEBUG", "") == "1":
                 print(f"Grouping by '{group_by}', total groups:", len(groups))
                 for gi, g in enumerate(groups):
                     print(f" Group {gi}: {len(g)} tests; example: {g[0]}")
-            shard_tests = []
-            for gi, group in enumerate(groups):
-                if gi % sc == si:
-                    shard_tests.extend(group)
+            if len(browsers) > 1:
+                shard_tests = assign_groups_balanced(groups, sc, browsers)[si]
+                shard_tests = interleave_by_browser(shard_tests, browsers)
+            else:
+                shard_tests = []
+                for gi, group in enumerate(groups):
+                    if gi % sc == si:
+                        shard_tests.extend(group)
 
     print(f"Collected {len(filtered_nodeids)} total nodeids → running {len(shard_tests)} on shard {si}/{sc}")
 
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+stream_merge.py - tail per-shard NDJSON result streams (written by pytest --results-stream),
+keep a live summary up to date and merge Allure results incrementally while shards run.
+
+Behavior:
+ - STREAM_GLOB: glob of stream files to tail (default: **/results-stream-*.ndjson, recursive).
+ - ALLURE_ROOT: directory searched for allure-results* dirs (default: artifacts/, as merge_allure.py).
+   New Allure files are copied into merged-allure-results/ once their size is stable across
+   two polls, so the final merge only has the tail end left to do.
+ - MERGE_ALLURE=0: only maintain the summary and leave the Allure merge to merge_allure.py.
+ - SUMMARY_PATH: live summary JSON rewritten on every change (default: results-summary.json).
+ - STREAM_MODE=once   -> single pass over whatever is on disk, then final merge (default).
+   STREAM_MODE=follow -> poll every POLL_INTERVAL seconds (default 2) until EXPECT_STREAMS
+                         streams (default: all discovered) have logged session_finish,
+                         or STREAM_TIMEOUT seconds (default 0 = no limit) have passed.
+ - FAIL_FAST=1: exit 1 as soon as a failed test is seen (and at the end if any failed).
+ - Runs `allure generate` at the end if the CLI is on PATH, like merge_allure.py.
+
+Results are keyed by (shard, nodeid): the same test on different shards (e.g. one per browser
+or environment) is counted once per shard. Streams without a shard id are keyed by their path.
+
+Live progress needs the streams and allure-results on a disk this script can see while the
+shards run (shards on one machine or a shared volume). The sharded GitHub workflow does not use it:
+its shards only share results as artifacts after they finish, so it keeps merge_allure.py.
+
+Usage:
+  STREAM_MODE=follow EXPECT_STREAMS=2 ALLURE_ROOT=. python .github/scripts/stream_merge.py
+"""
+from __future__ import annotations
+
+import glob
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from merge_allure import MERGED_DIR, ARTIFACTS_ROOT, copy_result_file, safe_prefix_from_path, try_generate_report
+
+
+class StreamTail:
+    """Reads complete lines appended to an NDJSON file since the last poll."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offset = 0
+        self.finished = False
+        self.shard = ""
+
+    @property
+    def key(self) -> str:
+        return self.shard or self.path
+
+    def read_events(self) -> List[dict]:
+        try:
+            with open(self.path, "rb") as fh:
+                fh.seek(self.offset)
+                chunk = fh.read()
+        except FileNotFoundError:
+            return []
+        # leave a partially written last line for the next poll
+        end = chunk.rfind(b"\n") + 1
+        self.offset += end
+        events = []
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                print(f"Skipping malformed line in {self.path}: {line[:80]!r}", file=sys.stderr)
+        return events
+
+
+class LiveSummary:
+    def __init__(self):
+        self.started_at = time.time()
+        self.running: Dict[Tuple[str, str], str] = {}
+        self.final: "OrderedDict[Tuple[str, str], dict]" = OrderedDict()
+        self.failed_seen: List[Tuple[str, str]] = []
+
+    def apply(self, stream: StreamTail, event: dict) -> Optional[Tuple[str, str]]:
+        """Apply one event; returns the (shard, nodeid) key if it is a newly seen failure."""
+        ev = event.get("ev")
+        if ev == "session_start":
+            stream.shard = event.get("shard", "")
+        elif ev == "session_finish":
+            stream.finished = True
+        elif ev == "start":
+            self.running[(stream.key, event["id"])] = stream.path
+        elif ev == "finish":
+            key = (stream.key, event["id"])
+            self.running.pop(key, None)
+            # last finish wins, so a rerun that passes replaces the earlier attempt on the same shard
+            self.final[key] = {"outcome": event.get("outcome"), "dur": event.get("dur")}
+            if event.get("props"):
+                self.final[key]["props"] = event["props"]
+            if event.get("outcome") == "failed" and key not in self.failed_seen:
+                self.failed_seen.append(key)
+                return key
+        return None
+
+    def to_dict(self, streams: List[StreamTail]) -> dict:
+        counts: Dict[str, int] = {}
+        for result in self.final.values():
+            counts[result["outcome"]] = counts.get(result["outcome"], 0) + 1
+        return {
+            "elapsed_s": round(time.time() - self.started_at, 1),
+            "counts": counts,
+            "running": [{"shard": shard, "id": nid} for shard, nid in sorted(self.running)],
+            "failed": [{"shard": shard, "id": nid} for (shard, nid), r in self.final.items()
+                       if r["outcome"] == "failed"],
+            "streams": [{"path": s.path, "shard": s.shard, "finished": s.finished} for s in streams],
+        }
+
+
+class IncrementalAllureMerge:
+    """Copies Allure result files into merged_dir as soon as they stop growing."""
+
+    def __init__(self, root: str, merged_dir: str = MERGED_DIR):
+        self.root = os.path.abspath(root)
+        self.merged_dir = os.path.abspath(merged_dir)
+        self.copied = set()
+        self.last_size: Dict[str, int] = {}
+
+    def poll(self, final: bool = False) -> int:
+        if not os.path.isdir(self.root):
+            return 0
+        copied = 0
+        for root, dirs, _ in os.walk(self.root):
+            for d in dirs:
+                if not d.startswith("allure-results"):
+                    continue
+                src_dir = os.path.join(root, d)
+                if os.path.abspath(src_dir) == self.merged_dir:
+                    continue
+                shard_prefix = safe_prefix_from_path(src_dir)
+                for subroot, _, filenames in os.walk(src_dir):
+                    rel_root = os.path.relpath(subroot, src_dir)
+                    target_dir = os.path.join(self.merged_dir, rel_root) if rel_root != "." else self.merged_dir
+                    for fn in filenames:
+                        src_file = os.path.join(subroot, fn)
+                        if src_file in self.copied:
+                            continue
+                        try:
+                            size = os.path.getsize(src_file)
+                        except OSError:
+                            continue
+                        stable = self.last_size.get(src_file) == size and size > 0
+                        self.last_size[src_file] = size
+                        if not (stable or final):
+                            continue
+                        os.makedirs(target_dir, exist_ok=True)
+                        copy_result_file(src_file, target_dir, shard_prefix)
+                        self.copied.add(src_file)
+                        copied += 1
+        return copied
+
+
+def write_summary(path: str, summary: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(summary, fh, indent=2)
+    os.replace(tmp, path)
+
+
+def main() -> None:
+    stream_glob = os.environ.get("STREAM_GLOB", "**/results-stream-*.ndjson")
+    allure_root = os.environ.get("ALLURE_ROOT", ARTIFACTS_ROOT)
+    summary_path = os.environ.get("SUMMARY_PATH", "results-summary.json")
+    mode = (os.environ.get("STREAM_MODE") or "once").strip().lower()
+    interval = float(os.environ.get("POLL_INTERVAL", "2"))
+    timeout = float(os.environ.get("STREAM_TIMEOUT", "0"))
+    expect_raw = (os.environ.get("EXPECT_STREAMS") or "").strip()
+    expect = int(expect_raw) if expect_raw else None
+    fail_fast = os.environ.get("FAIL_FAST", "") == "1"
+    merge_allure = os.environ.get("MERGE_ALLURE", "1") != "0"
+
+    if mode not in {"once", "follow"}:
+        print(f"Invalid STREAM_MODE='{mode}'; falling back to 'once'", file=sys.stderr)
+        mode = "once"
+
+    streams: "OrderedDict[str, StreamTail]" = OrderedDict()
+    summary = LiveSummary()
+    merger = IncrementalAllureMerge(allure_root) if merge_allure else None
+    last_printed = None
+
+    while True:
+        for path in sorted(glob.glob(stream_glob, recursive=True)):
+            if path not in streams:
+                print(f"Tailing stream: {path}")
+                streams[path] = StreamTail(path)
+
+        for stream in streams.values():
+            for event in stream.read_events():
+                failed = summary.apply(stream, event)
+                if failed:
+                    print(f"FAILED {failed[1]} (shard {stream.shard or '?'})")
+                    if fail_fast:
+                        write_summary(summary_path, summary.to_dict(list(streams.values())))
+                        print("FAIL_FAST=1 - stopping on first failure.")
+                        sys.exit(1)
+
+        copied = merger.poll(final=(mode == "once")) if merger else 0
+        state = summary.to_dict(list(streams.values()))
+        write_summary(summary_path, state)
+
+        done_streams = sum(1 for s in streams.values() if s.finished)
+        line = (f"[live] {state['counts']} running={len(state['running'])} "
+                f"streams done {done_streams}/{expect if expect is not None else len(streams)}")
+        if line != last_printed or copied:
+            print(line + (f" (+{copied} allure files)" if copied else ""))
+            last_printed = line
+
+        if mode == "once":
+            break
+        target = expect if expect is not None else len(streams)
+        if streams and done_streams >= target:
+            break
+        if timeout and time.time() - summary.started_at > timeout:
+            print(f"STREAM_TIMEOUT of {timeout}s reached; finishing with what is available.")
+            break
+        time.sleep(interval)
+
+    # final pass: whatever is left, regardless of size stability
+    copied = merger.poll(final=True) if merger else 0
+    if copied:
+        print(f"Final merge copied {copied} remaining allure files.")
+    write_summary(summary_path, summary.to_dict(list(streams.values())))
+    print("Summary written to:", summary_path)
+
+    if merger and merger.copied:
+        print("Merged results written to:", MERGED_DIR)
+        if not try_generate_report():
+            print("Merged results are ready in 'merged-allure-results'. "
+                  "Please run Allure CLI manually to generate HTML report.")
+
+    if fail_fast and summary.failed_seen:
+        sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
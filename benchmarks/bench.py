@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+bench.py - time the framework hot paths (drivers.py, pages/base_page.py) against the
+local stand-in server and compare the results with a saved baseline.
+
+Measured operations:
+ - driver startup/teardown for each browser in --browsers (unavailable browsers are skipped),
+   and for Chrome/Edge also with a cloned profile template when --profile-template is given
+ - BasePage._go_to, _type_text, _click (single attempt and with one retry),
+   _wait_until_element_is_visible (element present / absent)
+ - LoginPage._execute_login
+ - InventoryPage._click_add_to_cart_btn / _click_remove_btn
+
+Usage (from the repo root):
+  python -m benchmarks.bench --save benchmarks/baseline.json
+  python -m benchmarks.bench --compare benchmarks/baseline.json --threshold 0.15
+
+Options:
+  --browser     browser used for the page-level benchmarks (default chrome)
+  --browsers    comma-separated backends for the startup benchmark (default chrome,firefox,edge)
+  --rounds      measured rounds per operation (default 10, after 1 warm-up round)
+  --save        write results as a JSON baseline to this path
+  --compare     compare against this baseline; exit code 1 if any median regressed
+  --threshold   allowed relative slowdown of the median before flagging (default 0.10 = 10%)
+  --base-url    run against this URL instead of starting the stand-in server
+  --profile-template  profile template root (see profile_template.py); built if missing
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from selenium import __version__ as selenium_version
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.support import expected_conditions as ec
+from selenium.webdriver.support.wait import WebDriverWait
+
+from drivers import build_driver
+from pages.base_page import BasePage
+from pages.inventory_page import InventoryPage
+from pages.login_page import LoginPage
+from pages.menu import Menu
+from profile_template import TEMPLATE_BROWSERS, build_template, is_template_ready, template_dir_for
+
+success_login = ("standard_user", "secret_sauce")
+
+
+class _StaleOnClick:
+    """Wraps a located element so its click() raises StaleElementReferenceException without clicking."""
+
+    def __init__(self, elem):
+        self._elem = elem
+
+    def click(self):
+        raise StaleElementReferenceException("injected by benchmarks.bench")
+
+    def __getattr__(self, name):
+        return getattr(self._elem, name)
+
+
+class _StaleOncePage(BasePage):
+    """
+    Every other lookup returns an element whose first click() is stale, so BasePage._click
+    goes through exactly one retry and then clicks the real, still-live element. The DOM is
+    left untouched, so the page's handlers keep working across rounds.
+    """
+
+    _stale_next = True
+
+    def _wait_until_element_is_clickable(self, locator, wait_time=None):
+        elem = super()._wait_until_element_is_clickable(locator, wait_time)
+        stale, self._stale_next = self._stale_next, not self._stale_next
+        return _StaleOnClick(elem) if stale else elem
+
+
+def summarize(samples) -> Dict[str, float]:
+    ordered = sorted(samples)
+    p95 = ordered[max(1, math.ceil(0.95 * len(ordered))) - 1]
+    return {
+        "rounds": len(ordered),
+        "median_ms": statistics.median(ordered) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p95_ms": p95 * 1000,
+        "min_ms": ordered[0] * 1000,
+    }
+
+
+def measure(fn: Callable[[], None], rounds: int, setup: Optional[Callable[[], None]] = None,
+            warmup: int = 1) -> Dict[str, float]:
+    """Time `fn` for `rounds` rounds; `setup` runs before each round and is not timed."""
+    samples = []
+    for i in range(warmup + rounds):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            samples.append(elapsed)
+    return summarize(samples)
+
+
+@contextmanager
+def _profile_template_env(root: Optional[str]):
+    previous = os.environ.pop("BROWSER_PROFILE_TEMPLATE", None)
+    if root:
+        os.environ["BROWSER_PROFILE_TEMPLATE"] = root
+    try:
+        yield
+    finally:
+        os.environ.pop("BROWSER_PROFILE_TEMPLATE", None)
+        if previous is not None:
+            os.environ["BROWSER_PROFILE_TEMPLATE"] = previous
+
+
+def bench_driver_startup(browsers, rounds: int, base_url: str,
+                         profile_template: Optional[str] = None) -> Dict[str, dict]:
+    results = {}
+    for browser in browsers:
+        name = f"driver_startup_teardown[{browser}]"
+        try:
+            with _profile_template_env(None):
+                results[name] = measure(lambda: build_driver(browser, headless=True).quit(), rounds)
+        except Exception as exc:
+            print(f"Skipping {name}: {exc}", file=sys.stderr)
+            continue
+
+        if not profile_template or browser not in TEMPLATE_BROWSERS:
+            continue
+        name = f"driver_startup_teardown[{browser}+template]"
+        try:
+            template = template_dir_for(profile_template, browser)
+            if not is_template_ready(template):
+                build_template(browser, template, base_url)
+            with _profile_template_env(os.path.abspath(profile_template)):
+                results[name] = measure(lambda: build_driver(browser, headless=True).quit(), rounds)
+        except Exception as exc:
+            print(f"Skipping {name}: {exc}", file=sys.stderr)
+    return results
+
+
+def bench_pages(browser: str, base_url: str, rounds: int) -> Dict[str, dict]:
+    driver = build_driver(browser, headless=True)
+    results = {}
+    try:
+        base = BasePage(driver)
+        login_page = LoginPage(driver)
+        inventory_page = InventoryPage(driver)
+        stale_once = _StaleOncePage(driver)
+        inventory_url = base_url.rstrip("/") + "/inventory.html"
+
+        def open_login():
+            login_page._go_to(base_url, "clear_cookies")
+            driver.execute_script("window.localStorage.clear();")
+
+        def open_inventory():
+            open_login()
+            login_page._execute_login(*success_login)
+            login_page._wait_until_redirected_to(inventory_url)
+
+        def close_menu():
+            # an open menu covers the burger button on the real site (ElementClickInterceptedException)
+            base._hit_esc_key()
+            try:
+                WebDriverWait(driver, 2).until(ec.invisibility_of_element_located(Menu._logout_lnk))
+            except TimeoutException:
+                pass
+
+        def wait_absent():
+            try:
+                base._wait_until_element_is_visible(LoginPage._err_msg, 1)
+            except AssertionError:
+                pass
+
+        results["go_to"] = measure(lambda: base._go_to(base_url), rounds)
+
+        open_login()
+        results["type_text"] = measure(lambda: base._type_text(LoginPage._username_fld, success_login[0]), rounds)
+        results["wait_visible[present]"] = measure(
+            lambda: base._wait_until_element_is_visible(LoginPage._login_btn), rounds)
+        results["wait_visible[absent]"] = measure(wait_absent, rounds)
+
+        results["execute_login"] = measure(lambda: login_page._execute_login(*success_login), rounds,
+                                           setup=open_login)
+
+        open_inventory()
+        results["click[no_retry]"] = measure(lambda: base._click(Menu._burger_menu_btn, retries=1), rounds,
+                                             setup=close_menu)
+        results["click[with_retry]"] = measure(lambda: stale_once._click(Menu._burger_menu_btn), rounds,
+                                               setup=close_menu)
+
+        open_inventory()
+        add_times, remove_times = [], []
+        for i in range(1 + rounds):
+            started = time.perf_counter()
+            inventory_page._click_add_to_cart_btn(1)
+            added = time.perf_counter()
+            inventory_page._click_remove_btn(1)
+            removed = time.perf_counter()
+            if i >= 1:
+                add_times.append(added - started)
+                remove_times.append(removed - added)
+        results["cart_add"] = summarize(add_times)
+        results["cart_remove"] = summarize(remove_times)
+    finally:
+        driver.quit()
+    return results
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> bool:
+    """Print a comparison table; returns True if any median regressed beyond `threshold`."""
+    regressed = False
+    header = f"{'benchmark':<36} {'baseline ms':>12} {'current ms':>12} {'delta':>8}  status"
+    print(header)
+    print("-" * len(header))
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<36} {'-':>12} {cur['median_ms']:>12.2f} {'-':>8}  new")
+            continue
+        delta = (cur["median_ms"] - base["median_ms"]) / base["median_ms"] if base["median_ms"] else 0.0
+        status = "ok"
+        if delta > threshold:
+            status = "REGRESSION"
+            regressed = True
+        print(f"{name:<36} {base['median_ms']:>12.2f} {cur['median_ms']:>12.2f} {delta:>+8.1%}  {status}")
+    for name in baseline:
+        if name not in current:
+            print(f"{name:<36} {baseline[name]['median_ms']:>12.2f} {'-':>12} {'-':>8}  missing")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the framework hot paths.")
+    parser.add_argument("--browser", default="chrome")
+    parser.add_argument("--browsers", default="chrome,firefox,edge")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--save")
+    parser.add_argument("--compare")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--base-url")
+    parser.add_argument("--profile-template")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        from standin.server import start_server
+        server, base_url = start_server()
+
+    try:
+        browsers = [b.strip().lower() for b in args.browsers.split(",") if b.strip()]
+        results = bench_driver_startup(browsers, args.rounds, base_url, args.profile_template)
+        with _profile_template_env(None):
+            results.update(bench_pages(args.browser.lower(), base_url, args.rounds))
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    report = {
+        "meta": {
+            "browser": args.browser,
+            "rounds": args.rounds,
+            "python": platform.python_version(),
+            "selenium": selenium_version,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressed = compare(results, baseline["results"], args.threshold)
+        if regressed:
+            print(f"\nRegression beyond {args.threshold:.0%} detected.")
+            sys.exit(1)
+    else:
+        for name, r in results.items():
+            print(f"{name:<36} median {r['median_ms']:>9.2f} ms  p95 {r['p95_ms']:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
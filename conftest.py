@@ -1,28 +1,64 @@
 import os
-import pytest
-from selenium import webdriver
-from selenium.common.exceptions import WebDriverException
 
-# Chrome
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
+import allure
+import pytest
 
-# Firefox
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.firefox import GeckoDriverManager
+from drivers import build_driver, close_remote_connections
+from profile_template import TEMPLATE_BROWSERS, build_template, is_template_ready, template_dir_for
+from results_stream import ResultsStream
 
-# Edge
-from selenium.webdriver.edge.options import Options as EdgeOptions
-from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
+# pytester runs small throwaway suites against this conftest (tests/ci)
+pytest_plugins = ("pytester",)
 
 
 def pytest_addoption(parser):
     parser.addoption("--base-url", action="store", help="Base URL")
-    parser.addoption("--browser", action="store", default="chrome")
+    parser.addoption("--browser", action="store", default="chrome",
+                     help="Browser, or comma-separated list of browsers to run every test on e.g. chrome,firefox")
     parser.addoption("--headless", action="store_true", default=False)
+    parser.addoption("--results-stream", action="store", default=None,
+                     help="Append NDJSON test start/finish events to this file (see results_stream.py)")
+    parser.addoption("--profile-template", action="store", default=None,
+                     help="Chrome/Edge profile template root; built once if missing (see profile_template.py)")
+
+
+def pytest_configure(config):
+    _browsers(config)  # fail fast on an empty --browser
+
+    stream_path = config.getoption("--results-stream")
+    # xdist workers forward their reports to the controller, which does the writing
+    if stream_path and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(ResultsStream(stream_path), "results_stream")
+
+    template_root = config.getoption("--profile-template")
+    # built once on the controller; xdist workers inherit the env var when they are spawned
+    if template_root and not hasattr(config, "workerinput") and not os.environ.get("SELENIUM_REMOTE_URL"):
+        for browser in _browsers(config):
+            template = template_dir_for(template_root, browser)
+            if browser in TEMPLATE_BROWSERS and not is_template_ready(template):
+                build_template(browser, template, config.getoption("--base-url"))
+        os.environ["BROWSER_PROFILE_TEMPLATE"] = os.path.abspath(template_root)
+
+
+def _browsers(config) -> list[str]:
+    browsers = [b.strip().lower() for b in config.getoption("--browser").split(",") if b.strip()]
+    if not browsers:
+        raise pytest.UsageError("--browser needs at least one browser, e.g. --browser chrome "
+                                "or --browser chrome,firefox")
+    return browsers
+
+
+def pytest_generate_tests(metafunc):
+    # With several browsers every test using the driver runs once per browser.
+    # Params sit next to each other in collection order, so xdist spreads browsers across workers.
+    if "browser" in metafunc.fixturenames:
+        browsers = _browsers(metafunc.config)
+        if len(browsers) > 1:
+            metafunc.parametrize("browser", browsers, indirect=True)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    close_remote_connections()
 
 
 @pytest.fixture
@@ -31,95 +67,30 @@ def base_url(request):
 
 
 @pytest.fixture
-def driver(request):
-    browser = request.config.getoption("--browser").lower()
+def browser(request):
+    return getattr(request, "param", None) or _browsers(request.config)[0]
+
+
+@pytest.fixture
+def driver(request, browser):
     headless = request.config.getoption("--headless")
 
     # Force headless in CI
     if os.environ.get("GITHUB_ACTIONS") == "true":
         headless = True
 
-    chrome_prefs = {
-        "profile.password_manager_leak_detection": False,
-        "credentials_enable_service": False,
-    }
-
     print(f"WebDriver: browser={browser}, headless={headless}")
-
-    chromedriver_log = os.environ.get("CHROMEDRIVER_LOG", "/tmp/chromedriver.log")
-    geckodriver_log = os.environ.get("GECKODRIVER_LOG", "/tmp/geckodriver.log")
-    edgedriver_log = os.environ.get("EDGEDRIVER_LOG", "/tmp/edgedriver.log")
-
-    # ============ CHROME ============
-    if browser == "chrome":
-        options = ChromeOptions()
-        options.add_experimental_option("prefs", chrome_prefs)
-
-        if headless:
-            try:
-                options.add_argument("--headless=new")
-            except Exception:
-                options.add_argument("--headless")
-            options.add_argument("--window-size=1920,1080")
-
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--disable-software-rasterizer")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-background-timer-throttling")
-        options.add_argument("--disable-infobars")
-        options.add_argument("--no-first-run")
-
-        service = ChromeService(
-            executable_path=ChromeDriverManager().install(),
-            log_path=chromedriver_log,
-        )
-        driver = webdriver.Chrome(service=service, options=options)
-
-    # ============ FIREFOX ============
-    elif browser == "firefox":
-        options = FirefoxOptions()
-        if headless:
-            options.add_argument("--headless")
-            options.add_argument("--width=1920")
-            options.add_argument("--height=1080")
-
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-
-        service = FirefoxService(
-            executable_path=GeckoDriverManager().install(),
-            log_path=geckodriver_log,
-        )
-        driver = webdriver.Firefox(service=service, options=options)
-
-    # ============ EDGE ============
-    elif browser == "edge":
-        options = EdgeOptions()
-        if headless:
-            try:
-                options.add_argument("--headless=new")
-            except Exception:
-                options.add_argument("--headless")
-            options.add_argument("--window-size=1920,1080")
-
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-
-        service = EdgeService(
-            executable_path=EdgeChromiumDriverManager().install(),
-            log_path=edgedriver_log,
-        )
-        driver = webdriver.Edge(service=service, options=options)
-
-    else:
-        raise Exception(f"Unsupported browser: {browser}")
-
-    try:
-        driver.maximize_window()
-    except WebDriverException:
-        pass
+    allure.dynamic.tag(browser)
+
+    driver = build_driver(browser, headless)
+    if getattr(driver, "remote_endpoint", None):
+        print(f"WebDriver: remote={driver.remote_endpoint}, session queue wait={driver.session_queue_wait:.2f}s "
+              f"(local slot wait {driver.slot_wait:.2f}s)")
+        # kept out of the captured output: shown in Allure and carried by junitxml/--results-stream reports
+        allure.dynamic.parameter("session queue wait", f"{driver.session_queue_wait:.2f}s", excluded=True)
+        allure.dynamic.parameter("remote endpoint", driver.remote_endpoint, excluded=True)
+        request.node.user_properties.append(("session_queue_wait_s", round(driver.session_queue_wait, 3)))
+        request.node.user_properties.append(("slot_wait_s", round(driver.slot_wait, 3)))
 
     yield driver
     driver.quit()
@@ -0,0 +1,403 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+import urllib3
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+# Chrome
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from webdriver_manager.chrome import ChromeDriverManager
+
+# Firefox
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from webdriver_manager.firefox import GeckoDriverManager
+
+# Edge
+from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.edge.service import Service as EdgeService
+from webdriver_manager.microsoft import EdgeChromiumDriverManager
+
+from profile_template import TEMPLATE_BROWSERS, clone_template, is_template_ready, template_dir_for
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_BROWSERS = ("chrome", "firefox", "edge")
+
+
+def build_options(browser: str, headless: bool):
+    """
+    Builds the browser options shared by the local and remote backends.
+    :param browser: chrome | firefox | edge
+    :param headless:
+    :return: ChromeOptions | FirefoxOptions | EdgeOptions
+    """
+    chrome_prefs = {
+        "profile.password_manager_leak_detection": False,
+        "credentials_enable_service": False,
+    }
+
+    # ============ CHROME ============
+    if browser == "chrome":
+        options = ChromeOptions()
+        options.add_experimental_option("prefs", chrome_prefs)
+
+        if headless:
+            try:
+                options.add_argument("--headless=new")
+            except Exception:
+                options.add_argument("--headless")
+            options.add_argument("--window-size=1920,1080")
+
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-software-rasterizer")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-background-timer-throttling")
+        options.add_argument("--disable-infobars")
+        options.add_argument("--no-first-run")
+
+    # ============ FIREFOX ============
+    elif browser == "firefox":
+        options = FirefoxOptions()
+        if headless:
+            options.add_argument("--headless")
+            options.add_argument("--width=1920")
+            options.add_argument("--height=1080")
+
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+
+    # ============ EDGE ============
+    elif browser == "edge":
+        options = EdgeOptions()
+        if headless:
+            try:
+                options.add_argument("--headless=new")
+            except Exception:
+                options.add_argument("--headless")
+            options.add_argument("--window-size=1920,1080")
+
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+
+    else:
+        raise Exception(f"Unsupported browser: {browser}")
+
+    return options
+
+
+def _build_local_driver(browser: str, options):
+    chromedriver_log = os.environ.get("CHROMEDRIVER_LOG", "/tmp/chromedriver.log")
+    geckodriver_log = os.environ.get("GECKODRIVER_LOG", "/tmp/geckodriver.log")
+    edgedriver_log = os.environ.get("EDGEDRIVER_LOG", "/tmp/edgedriver.log")
+
+    if browser == "chrome":
+        service = ChromeService(
+            executable_path=ChromeDriverManager().install(),
+            log_path=chromedriver_log,
+        )
+        return webdriver.Chrome(service=service, options=options)
+
+    if browser == "firefox":
+        service = FirefoxService(
+            executable_path=GeckoDriverManager().install(),
+            log_path=geckodriver_log,
+        )
+        return webdriver.Firefox(service=service, options=options)
+
+    service = EdgeService(
+        executable_path=EdgeChromiumDriverManager().install(),
+        log_path=edgedriver_log,
+    )
+    return webdriver.Edge(service=service, options=options)
+
+
+# region Remote backend
+class _PooledRemoteConnection(RemoteConnection):
+    """
+    RemoteConnection whose keep-alive pool outlives a single session.
+    WebDriver.quit() calls close() on its executor, which would drop the warm
+    sockets; here that is a no-op and the pool is only cleared by close_pool().
+    """
+
+    def close(self):
+        pass
+
+    def close_pool(self):
+        super().close()
+
+
+class RemoteDriver(webdriver.Remote):
+    """Remote WebDriver that hands its grid slot back on quit()."""
+
+    session_queue_wait = 0.0
+    slot_wait = 0.0
+    remote_endpoint = None
+    _slot = None
+
+    def quit(self) -> None:
+        try:
+            super().quit()
+        finally:
+            slot, self._slot = self._slot, None
+            _release_slot(slot)
+
+
+_remote_lock = threading.Lock()
+_remote_connections: Dict[str, _PooledRemoteConnection] = {}
+_capacity_lock = threading.Lock()
+_capacity: Optional[int] = None
+_capacity_probed = False
+_next_endpoint = 0
+
+
+def remote_endpoints() -> List[str]:
+    """
+    Grid/standalone endpoints from SELENIUM_REMOTE_URL (comma-separated for failover).
+    Empty list means the local backend is used.
+    """
+    raw = os.environ.get("SELENIUM_REMOTE_URL", "")
+    return [u.strip().rstrip("/") for u in raw.split(",") if u.strip()]
+
+
+def _get_remote_connection(endpoint: str) -> _PooledRemoteConnection:
+    with _remote_lock:
+        conn = _remote_connections.get(endpoint)
+        if conn is None:
+            pool_size = int(os.environ.get("SELENIUM_REMOTE_POOL_SIZE", "8"))
+            client_config = ClientConfig(
+                remote_server_addr=endpoint,
+                keep_alive=True,
+                init_args_for_pool_manager={"init_args_for_pool_manager": {"maxsize": pool_size}},
+            )
+            conn = _PooledRemoteConnection(client_config=client_config)
+            _remote_connections[endpoint] = conn
+        return conn
+
+
+def _grid_capacity(endpoints: List[str]) -> Optional[int]:
+    """
+    Total session slots reported by the endpoints' /status, or None if unknown.
+    SELENIUM_REMOTE_MAX_SESSIONS overrides discovery.
+    """
+    override = os.environ.get("SELENIUM_REMOTE_MAX_SESSIONS", "").strip()
+    if override:
+        return int(override)
+
+    total = 0
+    for endpoint in endpoints:
+        try:
+            with urllib.request.urlopen(f"{endpoint}/status", timeout=5) as resp:
+                status = json.load(resp)
+        except (OSError, ValueError) as exc:
+            logger.warning("Could not read grid status from %s: %s", endpoint, exc)
+            continue
+        for node in status.get("value", {}).get("nodes", []):
+            total += len(node.get("slots", []))
+    return total or None
+
+
+def _get_capacity(endpoints: List[str]) -> Optional[int]:
+    global _capacity, _capacity_probed
+    # probed once per process; _remote_lock is not held so pool lookups are never blocked by /status
+    with _capacity_lock:
+        if not _capacity_probed:
+            _capacity = _grid_capacity(endpoints)
+            _capacity_probed = True
+            if _capacity:
+                logger.info("Limiting concurrent remote sessions to grid capacity: %s", _capacity)
+        return _capacity
+
+
+def _slot_dir(endpoints: List[str]) -> str:
+    """
+    Directory of slot lock files shared by every process on this host that targets the same
+    endpoints (xdist workers, loadgen threads, parallel pytest runs).
+    SELENIUM_REMOTE_SLOT_DIR overrides the default location under the temp dir.
+    """
+    override = os.environ.get("SELENIUM_REMOTE_SLOT_DIR", "").strip()
+    if override:
+        return override
+    key = hashlib.sha1(",".join(sorted(endpoints)).encode("utf-8")).hexdigest()[:8]
+    return os.path.join(tempfile.gettempdir(), f"selenium-grid-slots-{key}")
+
+
+def _acquire_slot(endpoints: List[str]):
+    """
+    Block until one of the grid's session slots is free and return its lease (or None when
+    the capacity is unknown). A slot is an exclusive flock on slot-<n>.lock; locks belong to
+    the open file, so the cap holds across threads and processes alike, and a crashed worker's
+    slot is freed by the OS. Without fcntl (Windows) there is no cap.
+    """
+    capacity = _get_capacity(endpoints)
+    if not capacity or fcntl is None:
+        return None
+
+    slot_dir = _slot_dir(endpoints)
+    os.makedirs(slot_dir, exist_ok=True)
+    timeout = float(os.environ.get("SELENIUM_REMOTE_SLOT_TIMEOUT", "600"))
+    deadline = time.monotonic() + timeout
+    while True:
+        for n in range(capacity):
+            fh = open(os.path.join(slot_dir, f"slot-{n}.lock"), "a")
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                fh.close()
+                continue
+            return fh
+        if time.monotonic() > deadline:
+            raise WebDriverException(f"No free grid slot (capacity {capacity}) after {timeout}s")
+        time.sleep(0.2)
+
+
+def _release_slot(slot) -> None:
+    if slot is not None:
+        # closing the file drops the flock
+        slot.close()
+
+
+def _build_remote_driver(options, endpoints: List[str]) -> RemoteDriver:
+    """
+    Creates a session on the first healthy endpoint, rotating the starting endpoint
+    per session and failing over to the next one on errors.
+    SELENIUM_REMOTE_RETRIES sets how many passes over the endpoint list are made (at least one).
+    session_queue_wait on the returned driver is the whole time to get a session: waiting for
+    a local slot lease (slot_wait) plus the new-session request, which includes any time spent
+    in the grid's own session queue.
+    """
+    global _next_endpoint
+    retries = max(1, int(os.environ.get("SELENIUM_REMOTE_RETRIES", "2")))
+    backoff = float(os.environ.get("SELENIUM_REMOTE_RETRY_DELAY", "1"))
+
+    requested = time.perf_counter()
+    slot = _acquire_slot(endpoints)
+    slot_wait = time.perf_counter() - requested
+
+    with _remote_lock:
+        start = _next_endpoint
+        _next_endpoint = (_next_endpoint + 1) % len(endpoints)
+
+    last_exc: Optional[BaseException] = None
+    try:
+        for attempt in range(1, retries + 1):
+            for offset in range(len(endpoints)):
+                endpoint = endpoints[(start + offset) % len(endpoints)]
+                try:
+                    driver = RemoteDriver(command_executor=_get_remote_connection(endpoint), options=options)
+                except (WebDriverException, urllib3.exceptions.HTTPError, OSError) as exc:
+                    logger.warning("Session creation on %s failed (pass %s/%s): %s", endpoint, attempt, retries, exc)
+                    last_exc = exc
+                    continue
+                driver.session_queue_wait = time.perf_counter() - requested
+                driver.slot_wait = slot_wait
+                driver.remote_endpoint = endpoint
+                driver._slot = slot
+                return driver
+            if attempt < retries:
+                time.sleep(backoff * attempt)
+    except BaseException:
+        _release_slot(slot)
+        raise
+
+    _release_slot(slot)
+    raise WebDriverException(f"Could not create a remote session on any of {endpoints}") from last_exc
+
+
+def close_remote_connections() -> None:
+    """Drop the pooled keep-alive connections and the probed capacity. Call once at the end of a run."""
+    global _capacity, _capacity_probed, _next_endpoint
+    with _remote_lock:
+        for conn in _remote_connections.values():
+            conn.close_pool()
+        _remote_connections.clear()
+        _next_endpoint = 0
+    with _capacity_lock:
+        _capacity = None
+        _capacity_probed = False
+# endregion
+
+
+# region Profile template
+def _clone_profile_template(browser: str) -> Optional[str]:
+    """
+    Clone of the prebuilt profile when BROWSER_PROFILE_TEMPLATE points at a template root
+    (see profile_template.py); None means the browser starts from an empty profile.
+    """
+    root = os.environ.get("BROWSER_PROFILE_TEMPLATE", "").strip()
+    if not root or browser not in TEMPLATE_BROWSERS:
+        return None
+    template = template_dir_for(root, browser)
+    if not is_template_ready(template):
+        logger.info("No profile template for %s at %s; using an empty profile.", browser, template)
+        return None
+    return clone_template(template)
+
+
+def _remove_on_quit(driver, path: str) -> None:
+    quit_driver = driver.quit
+
+    def quit():
+        try:
+            quit_driver()
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+    driver.quit = quit
+# endregion
+
+
+def build_driver(browser: str, headless: bool):
+    """
+    Builds a WebDriver for the given browser.
+    Uses the remote backend when SELENIUM_REMOTE_URL is set, local services otherwise.
+    Local Chrome/Edge start from a clone of the profile template when BROWSER_PROFILE_TEMPLATE is set.
+    Shared by the `driver` fixture in conftest.py and by loadgen.py.
+    :param browser: chrome | firefox | edge
+    :param headless:
+    :return: WebDriver
+    """
+    browser = browser.lower()
+    options = build_options(browser, headless)
+
+    endpoints = remote_endpoints()
+    if endpoints:
+        driver = _build_remote_driver(options, endpoints)
+    else:
+        profile_clone = _clone_profile_template(browser)
+        if profile_clone:
+            options.add_argument(f"--user-data-dir={profile_clone}")
+        try:
+            driver = _build_local_driver(browser, options)
+        except BaseException:
+            if profile_clone:
+                shutil.rmtree(profile_clone, ignore_errors=True)
+            raise
+        if profile_clone:
+            _remove_on_quit(driver, profile_clone)
+
+    try:
+        driver.maximize_window()
+    except WebDriverException:
+        pass
+
+    return driver
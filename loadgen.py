@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+loadgen.py - drive N concurrent synthetic users through the page-object flows.
+
+Each virtual user owns one headless browser and loops over a flow built from
+the same page objects and `allure.step` blocks as the tests in tests/. Step
+timings are captured by hooking allure's start_step/stop_step, so the report
+has one row per `allure.step` block of the flow, keyed by its position in the
+flow and its title (a flow may reuse a title for different blocks).
+
+When run_load is called from inside a pytest test with allure-pytest active,
+allure attaches the virtual users' steps to that test's result as well (steps
+from new threads join the item open on the thread that started them). Keep
+in-pytest runs small, or use the CLI for long runs.
+
+Usage:
+  python loadgen.py --base-url https://www.saucedemo.com/ --flow cart --users 5 --duration 60 --ramp-up 10
+  python loadgen.py --standin --flow login --users 2 --iterations 3
+
+Options:
+  --flow         login | cart
+  --users        number of concurrent virtual users (browsers)
+  --duration     run for this many seconds (mutually exclusive with --iterations)
+  --iterations   number of flow iterations per user
+  --ramp-up      seconds over which user start times are spread evenly
+  --standin      serve standin/ locally and use it as --base-url (offline runs)
+  --json         also write the report to this path as JSON
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import allure
+import allure_commons
+
+from drivers import SUPPORTED_BROWSERS, build_driver, close_remote_connections
+from pages.cart_page import Cart
+from pages.inventory_page import InventoryPage
+from pages.login_page import LoginPage
+from pages.menu import Menu
+
+success_login = ("standard_user", "secret_sauce")
+
+
+# region Flows
+class FlowPages:
+    def __init__(self, driver):
+        self.driver = driver
+        self.login_page = LoginPage(driver)
+        self.inventory_page = InventoryPage(driver)
+        self.cart = Cart(driver)
+        self.menu = Menu(driver)
+
+
+def login_flow(pages: FlowPages, base_url: str) -> None:
+    """Mirrors TestLogin.test_success_login."""
+    with allure.step("Go to homepage and clear all cookies."):
+        pages.login_page._go_to(base_url, "clear_cookies")
+
+    with allure.step("Login user using valid credentials."):
+        pages.login_page._execute_login(*success_login)
+
+    with allure.step("Verify that user was successfully logged in."):
+        assert not pages.login_page._is_error_header_displayed(), "User was not logged in."
+
+    with allure.step("Logout user."):
+        pages.menu.logout_user(base_url)
+
+
+def cart_flow(pages: FlowPages, base_url: str) -> None:
+    """Mirrors TestCartFunc.test_decreasing_badge_count."""
+    with allure.step("Login user"):
+        pages.login_page._go_to(base_url)
+        pages.login_page._execute_login(*success_login)
+
+    with allure.step("Add first product to cart."):
+        pages.inventory_page._click_add_to_cart_btn(1)
+
+    with allure.step("Verify that cart badge count is correct."):
+        badge_count = pages.cart._get_cart_badge_count()
+        assert badge_count == 1, f"Expected badge count is 1, but got {badge_count}"
+
+    with allure.step("Remove the same product from cart."):
+        pages.inventory_page._click_remove_btn(1)
+
+    with allure.step("Verify that cart badge count is correct."):
+        assert not pages.cart._is_badge_count_visible(), "Badge count should not visible."
+
+
+FLOWS: Dict[str, Callable[[FlowPages, str], None]] = {
+    "login": login_flow,
+    "cart": cart_flow,
+}
+# endregion
+
+
+# region Metrics
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile; samples need not be sorted."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class StepRecorder:
+    """
+    Allure plugin that times every `allure.step` block on any thread.
+    Registered with allure_commons.plugin_manager for the duration of a run.
+    Steps are keyed by (ordinal, title): the ordinal is the step's position within
+    the current flow iteration, reset by begin_iteration() on the calling thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open: Dict[object, tuple] = {}
+        self.samples: "OrderedDict[Tuple[int, str], List[float]]" = OrderedDict()
+        self.errors: Dict[Tuple[int, str], int] = {}
+
+    def begin_iteration(self) -> None:
+        self._local.ordinal = 0
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        ordinal = getattr(self._local, "ordinal", 0) + 1
+        self._local.ordinal = ordinal
+        self._open[uuid] = ((ordinal, title), time.perf_counter())
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        finished = time.perf_counter()
+        key, started = self._open.pop(uuid, (None, None))
+        if key is None:
+            return
+        with self._lock:
+            if exc_type is not None:
+                self.errors[key] = self.errors.get(key, 0) + 1
+            else:
+                self.samples.setdefault(key, []).append(finished - started)
+# endregion
+
+
+class VirtualUser(threading.Thread):
+    def __init__(self, index: int, flow: Callable, base_url: str, browser: str, start_delay: float,
+                 iterations: Optional[int], deadline: Optional[float], recorder: StepRecorder):
+        super().__init__(name=f"vu-{index}", daemon=True)
+        self.flow = flow
+        self.recorder = recorder
+        self.base_url = base_url
+        self.browser = browser
+        self.start_delay = start_delay
+        self.iterations = iterations
+        self.deadline = deadline
+        self.completed = 0
+        self.failed = 0
+        self.startup_error: Optional[BaseException] = None
+        self.session_queue_wait = 0.0
+
+    def _should_continue(self) -> bool:
+        if self.iterations is not None:
+            return self.completed + self.failed < self.iterations
+        return time.monotonic() < self.deadline
+
+    def run(self) -> None:
+        time.sleep(self.start_delay)
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return
+        try:
+            driver = build_driver(self.browser, headless=True)
+        except Exception as exc:
+            self.startup_error = exc
+            return
+        self.session_queue_wait = getattr(driver, "session_queue_wait", 0.0)
+        try:
+            pages = FlowPages(driver)
+            while self._should_continue():
+                try:
+                    self.recorder.begin_iteration()
+                    self.flow(pages, self.base_url)
+                    self.completed += 1
+                except Exception as exc:
+                    self.failed += 1
+                    print(f"[{self.name}] iteration failed: {exc}", file=sys.stderr)
+                    # start the next iteration from a clean session
+                    try:
+                        driver.delete_all_cookies()
+                        driver.execute_script("window.localStorage.clear();")
+                    except Exception:
+                        pass
+        finally:
+            driver.quit()
+
+
+def run_load(flow_name: str, base_url: str, users: int, browser: str = "chrome", ramp_up: float = 0.0,
+             duration: Optional[float] = None, iterations: Optional[int] = None) -> dict:
+    """
+    Run `flow_name` across `users` concurrent virtual users and return the report dict.
+    Exactly one of `duration` (seconds) or `iterations` (per user) must be given.
+    """
+    if (duration is None) == (iterations is None):
+        raise ValueError("Pass exactly one of duration or iterations.")
+    flow = FLOWS[flow_name]
+
+    recorder = StepRecorder()
+    allure_commons.plugin_manager.register(recorder)
+    try:
+        started = time.monotonic()
+        deadline = started + ramp_up + duration if duration is not None else None
+        step = ramp_up / users if users > 1 else 0.0
+        vus = [VirtualUser(i, flow, base_url, browser, i * step, iterations, deadline, recorder)
+               for i in range(users)]
+        for vu in vus:
+            vu.start()
+        for vu in vus:
+            vu.join()
+        elapsed = time.monotonic() - started
+    finally:
+        allure_commons.plugin_manager.unregister(recorder)
+        close_remote_connections()
+
+    startup_errors = [f"{vu.name}: {vu.startup_error}" for vu in vus if vu.startup_error is not None]
+    completed = sum(vu.completed for vu in vus)
+    failed = sum(vu.failed for vu in vus)
+    queue_waits = [vu.session_queue_wait for vu in vus if vu.startup_error is None]
+
+    steps = []
+    for key in sorted(set(recorder.samples) | set(recorder.errors)):
+        ordinal, title = key
+        samples = recorder.samples.get(key, [])
+        steps.append({
+            "ordinal": ordinal,
+            "step": title,
+            "count": len(samples),
+            "errors": recorder.errors.get(key, 0),
+            "throughput_per_s": len(samples) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+        })
+
+    return {
+        "flow": flow_name,
+        "base_url": base_url,
+        "browser": browser,
+        "users": users,
+        "ramp_up_s": ramp_up,
+        "elapsed_s": elapsed,
+        "iterations_completed": completed,
+        "iterations_failed": failed,
+        "throughput_per_s": completed / elapsed if elapsed else 0.0,
+        "startup_errors": startup_errors,
+        "session_queue_wait_max_s": max(queue_waits, default=0.0),
+        "steps": steps,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"Flow '{report['flow']}' against {report['base_url']} "
+          f"({report['users']} users, {report['browser']}, ramp-up {report['ramp_up_s']:.1f}s)")
+    print(f"Elapsed {report['elapsed_s']:.1f}s, iterations ok={report['iterations_completed']} "
+          f"failed={report['iterations_failed']}, throughput {report['throughput_per_s']:.2f} it/s")
+    if report["session_queue_wait_max_s"]:
+        print(f"Longest remote session wait (slot + grid queue): {report['session_queue_wait_max_s']:.2f}s")
+    for err in report["startup_errors"]:
+        print(f"  driver startup failed - {err}")
+    print()
+    header = f"{'step':<48} {'count':>6} {'err':>4} {'rps':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for s in report["steps"]:
+        label = f"{s['ordinal']}. {s['step']}"
+        print(f"{label[:48]:<48} {s['count']:>6} {s['errors']:>4} {s['throughput_per_s']:>7.2f} "
+              f"{s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a page-object flow as concurrent synthetic users.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--base-url", help="Base URL")
+    target.add_argument("--standin", action="store_true", help="Serve the local stand-in and target it")
+    parser.add_argument("--flow", choices=sorted(FLOWS), default="login")
+    parser.add_argument("--browser", choices=SUPPORTED_BROWSERS, default="chrome")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--ramp-up", type=float, default=0.0)
+    stop = parser.add_mutually_exclusive_group(required=True)
+    stop.add_argument("--duration", type=float)
+    stop.add_argument("--iterations", type=int)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    if args.users < 1:
+        parser.error("--users must be at least 1")
+
+    server = None
+    base_url = args.base_url
+    if args.standin:
+        from standin.server import start_server
+        server, base_url = start_server()
+
+    try:
+        report = run_load(args.flow, base_url, args.users, browser=args.browser, ramp_up=args.ramp_up,
+                          duration=args.duration, iterations=args.iterations)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nReport written to {args.json_path}")
+
+    sys.exit(0 if report["iterations_failed"] == 0 and not report["startup_errors"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,11 @@ from pages.base_page import BasePage
 
 class Cart(BasePage):
     _shopping_cart_badge = (By.CSS_SELECTOR, "span[data-test='shopping-cart-badge']")
+    # Swag Labs keeps the cart client-side as a JSON list of product ids
+    _cart_storage_key = "cart-contents"
+
+    # Product ids in the order they are listed on the inventory page (default A-Z sort)
+    product_ids = (4, 0, 1, 5, 2, 3)
 
     def _is_badge_count_visible(self) -> bool:
         """
@@ -16,3 +21,35 @@ class Cart(BasePage):
 
     def _get_cart_badge_count(self) -> int:
         return int(super()._find_element(self._shopping_cart_badge).text)
+
+    def _seed_cart(self, ids) -> None:
+        """
+        Writes the given product ids straight into the app's cart storage and reloads once,
+        instead of clicking "Add to cart" per product. Must be called on a logged-in app page.
+        :param ids: product ids e.g. Cart.product_ids[:3]
+        """
+        ids = list(ids)
+        if ids:
+            self.driver.execute_script("window.localStorage.setItem(arguments[0], JSON.stringify(arguments[1]));",
+                                       self._cart_storage_key, ids)
+        else:
+            self.driver.execute_script("window.localStorage.removeItem(arguments[0]);", self._cart_storage_key)
+        self.driver.refresh()
+
+    def _get_cart_storage(self) -> list[int]:
+        """Returns the product ids currently held in the app's cart storage."""
+        return self.driver.execute_script(
+            "return JSON.parse(window.localStorage.getItem(arguments[0]) || '[]');", self._cart_storage_key)
+
+    def _is_seeded_cart_consistent(self, ids) -> bool:
+        """
+        Returns True if the cart storage holds exactly the given ids and the badge shows
+        the same count (or is hidden for an empty cart).
+        :return: bool
+        """
+        expected = sorted(ids)
+        if sorted(self._get_cart_storage()) != expected:
+            return False
+        if not expected:
+            return not self._is_badge_count_visible()
+        return self._is_badge_count_visible() and self._get_cart_badge_count() == len(expected)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+profile_template.py - prebuilt Chrome/Edge user-data-dir that new drivers clone instead of
+starting from an empty temporary profile.
+
+The template is built once (per image or per test session) by launching the browser with the
+same options as drivers.build_driver, letting it create and persist its profile (prefs from
+build_options such as password-leak detection off, first-run state) and visiting --base-url so
+the HTTP cache is warm. drivers.build_driver clones it per driver when
+BROWSER_PROFILE_TEMPLATE points at the template root (one subdirectory per browser).
+
+Only what saves startup work is kept in the template: Local State, the First Run sentinel,
+Default/Preferences and Secure Preferences, plus the HTTP and code caches while they fit in
+PROFILE_TEMPLATE_CACHE_MB (default 8). Everything else the browser wrote (history, databases,
+component and GPU caches, ...) is dropped, so a clone stays a small copy on any filesystem,
+including ext4 and Docker's overlayfs where copy-on-write is not available.
+
+Clones use `cp --reflink=auto` (copy-on-write on btrfs/xfs, a plain copy elsewhere). Hardlinks
+are not used because Chrome updates its files in place, which would corrupt the shared template.
+
+Usage:
+  python -m profile_template --browser chrome --out /opt/profile-template --base-url https://www.saucedemo.com/
+  BROWSER_PROFILE_TEMPLATE=/opt/profile-template pytest ...
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Optional
+
+TEMPLATE_BROWSERS = ("chrome", "edge")
+TEMPLATE_MARKER = ".template-ready"
+# per-process lock files that must not be carried over into a clone
+_LOCK_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile")
+# relative to the user-data-dir; kept in the template whenever the browser wrote them
+_PROFILE_FILES = ("Local State", "First Run",
+                  os.path.join("Default", "Preferences"), os.path.join("Default", "Secure Preferences"))
+# kept in this order while their combined size fits the cache budget
+_CACHE_DIRS = (os.path.join("Default", "Cache"), os.path.join("Default", "Code Cache"))
+
+
+def template_dir_for(root: str, browser: str) -> str:
+    return os.path.join(root, browser)
+
+
+def is_template_ready(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, TEMPLATE_MARKER))
+
+
+def _tree_size(path: str) -> int:
+    size = 0
+    for root, _, filenames in os.walk(path):
+        for fn in filenames:
+            file_path = os.path.join(root, fn)
+            if not os.path.islink(file_path):
+                size += os.path.getsize(file_path)
+    return size
+
+
+def _prune_template(path: str, cache_budget: int) -> None:
+    """Reduces a freshly built profile to _PROFILE_FILES and the _CACHE_DIRS that fit in `cache_budget` bytes."""
+    keep = [rel for rel in _PROFILE_FILES if os.path.isfile(os.path.join(path, rel))]
+    used = 0
+    for rel in _CACHE_DIRS:
+        size = _tree_size(os.path.join(path, rel))
+        if size and used + size <= cache_budget:
+            keep.append(rel)
+            used += size
+
+    staging = path.rstrip(os.sep) + ".prune"
+    if os.path.exists(staging):
+        shutil.rmtree(staging)
+    for rel in keep:
+        target = os.path.join(staging, rel)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(os.path.join(path, rel), target)
+    os.makedirs(staging, exist_ok=True)
+    shutil.rmtree(path)
+    os.replace(staging, path)
+
+
+def _drop_process_state(path: str) -> None:
+    """Removes lock files and symlinks (Chrome's Singleton* links point at the process that made them)."""
+    for root, dirs, filenames in os.walk(path):
+        # os.walk lists symlinks to directories under dirs but does not descend into them
+        for name in dirs + filenames:
+            target = os.path.join(root, name)
+            if os.path.islink(target) or (name in _LOCK_FILES and os.path.isfile(target)):
+                os.remove(target)
+
+
+def build_template(browser: str, path: str, base_url: Optional[str] = None) -> str:
+    """
+    Builds a profile template for `browser` at `path` (replacing any existing one).
+    :return: path
+    """
+    # imported here as drivers imports the clone helpers from this module
+    from drivers import _build_local_driver, build_options
+
+    browser = browser.lower()
+    if browser not in TEMPLATE_BROWSERS:
+        raise Exception(f"Profile templates are only supported for {TEMPLATE_BROWSERS}, got: {browser}")
+
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+
+    options = build_options(browser, headless=True)
+    options.add_argument(f"--user-data-dir={path}")
+    driver = _build_local_driver(browser, options)
+    try:
+        if base_url:
+            driver.get(base_url)
+    finally:
+        driver.quit()
+
+    _prune_template(path, int(float(os.environ.get("PROFILE_TEMPLATE_CACHE_MB", "8")) * 1024 * 1024))
+    open(os.path.join(path, TEMPLATE_MARKER), "w").close()
+    return path
+
+
+def clone_template(path: str) -> str:
+    """
+    Returns a fresh private copy of the template in a temporary directory.
+    The caller removes it when the driver quits.
+    """
+    clone = tempfile.mkdtemp(prefix="profile-")
+    try:
+        subprocess.run(["cp", "-a", "--reflink=auto", f"{path}/.", clone], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except (OSError, subprocess.CalledProcessError):
+        # no GNU cp (e.g. macOS/Windows): fall back to a regular copy
+        shutil.copytree(path, clone, dirs_exist_ok=True, symlinks=True,
+                        ignore=shutil.ignore_patterns(*_LOCK_FILES))
+    _drop_process_state(clone)
+    os.remove(os.path.join(clone, TEMPLATE_MARKER))
+    return clone
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build Chrome/Edge profile templates for drivers to clone.")
+    parser.add_argument("--browser", default="chrome",
+                        help="Browser, or comma-separated list of browsers (chrome, edge)")
+    parser.add_argument("--out", required=True, help="Template root; one subdirectory is created per browser")
+    parser.add_argument("--base-url", help="URL visited once so its caches are warm in the template")
+    args = parser.parse_args()
+
+    for browser in [b.strip().lower() for b in args.browser.split(",") if b.strip()]:
+        if browser not in TEMPLATE_BROWSERS:
+            print(f"Skipping {browser}: profile templates are only supported for {TEMPLATE_BROWSERS}",
+                  file=sys.stderr)
+            continue
+        path = build_template(browser, template_dir_for(args.out, browser), args.base_url)
+        print(f"Profile template for {browser} written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import json
+import os
+import time
+
+
+class ResultsStream:
+    """
+    Pytest plugin that appends one compact NDJSON event per line to a per-shard stream:
+      {"ev": "session_start", "shard": "0", "t": ...}
+      {"ev": "start", "id": <nodeid>, "t": ...}
+      {"ev": "finish", "id": <nodeid>, "outcome": "passed|failed|skipped|rerun", "dur": <s>, "w": <xdist worker>,
+       "props": {<report.user_properties, only when set, e.g. session_queue_wait_s>}, "t": ...}
+    Only finish events carry the worker id ("w", null without xdist): the controller's logstart hook
+    gets just the nodeid and location, while the finish report still references the worker node.
+      {"ev": "session_finish", "exit": <exitstatus>, "t": ...}
+    Registered only on the controller process: under xdist the controller receives every
+    worker's logstart/logreport, so there is a single writer per stream.
+    .github/scripts/stream_merge.py tails these files while the run is in progress.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.shard = os.environ.get("SHARD_INDEX", "")
+        self._phases = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _emit(self, **event) -> None:
+        event["t"] = round(time.time(), 3)
+        # one write per line so a tailing reader never sees interleaved events
+        os.write(self._fd, (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8"))
+
+    def pytest_sessionstart(self, session):
+        self._emit(ev="session_start", shard=self.shard)
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self._emit(ev="start", id=nodeid)
+
+    def pytest_runtest_logreport(self, report):
+        outcome, duration = self._phases.get(report.nodeid, ("passed", 0.0))
+        duration += report.duration
+        if outcome == "passed" and report.outcome != "passed":
+            outcome = report.outcome
+        self._phases[report.nodeid] = (outcome, duration)
+
+        if report.when != "teardown":
+            return
+        del self._phases[report.nodeid]
+        node = getattr(report, "node", None)
+        worker = node.gateway.id if node is not None else None
+        extra = {"props": dict(report.user_properties)} if report.user_properties else {}
+        self._emit(ev="finish", id=report.nodeid, outcome=outcome, dur=round(duration, 3), w=worker, **extra)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self._emit(ev="session_finish", exit=int(exitstatus))
+        os.close(self._fd)
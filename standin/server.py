@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Swag Labs so the page objects can be exercised offline.
+
+Serves standin/static/ over plain HTTP. Only the parts of the site used by
+pages/ are implemented (login, inventory add/remove, cart badge, menu/logout).
+
+Usage:
+  python -m standin.server --port 8000
+  pytest --base-url http://127.0.0.1:8000/ ...
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        # keep load runs and pytest output readable
+        pass
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the stand-in server on a background thread.
+    Pass port=0 to let the OS pick a free port.
+    :return: (server, base_url) - call server.shutdown() when done.
+    """
+    handler = functools.partial(_QuietHandler, directory=STATIC_DIR)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="standin-server", daemon=True)
+    thread.start()
+    bound_host, bound_port = server.server_address[:2]
+    return server, f"http://{bound_host}:{bound_port}/"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the local Swag Labs stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    handler = functools.partial(_QuietHandler, directory=STATIC_DIR)
+    with ThreadingHTTPServer((args.host, args.port), handler) as server:
+        print(f"Swag Labs stand-in serving on http://{args.host}:{args.port}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
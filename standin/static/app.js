@@ -0,0 +1,159 @@
+// Minimal Swag Labs stand-in. Only the pieces the page objects touch are implemented:
+// login form, inventory add/remove buttons, cart badge, burger menu and logout.
+// Session and cart state are kept where the real site keeps them
+// (`session-username` cookie and `cart-contents` in localStorage).
+
+var CART_KEY = "cart-contents";
+var SESSION_COOKIE = "session-username";
+
+var USERS = {
+    "standard_user": "secret_sauce",
+    "locked_out_user": "secret_sauce"
+};
+
+var PRODUCTS = [
+    {id: 4, name: "Sauce Labs Backpack"},
+    {id: 0, name: "Sauce Labs Bike Light"},
+    {id: 1, name: "Sauce Labs Bolt T-Shirt"},
+    {id: 5, name: "Sauce Labs Fleece Jacket"},
+    {id: 2, name: "Sauce Labs Onesie"},
+    {id: 3, name: "Test.allTheThings() T-Shirt (Red)"}
+];
+
+function slug(name) {
+    return name.toLowerCase().replace(/[^a-z0-9]+/g, "-").replace(/^-|-$/g, "");
+}
+
+function getSession() {
+    var match = document.cookie.match(new RegExp("(?:^|; )" + SESSION_COOKIE + "=([^;]*)"));
+    return match ? decodeURIComponent(match[1]) : null;
+}
+
+function getCart() {
+    try {
+        return JSON.parse(window.localStorage.getItem(CART_KEY)) || [];
+    } catch (e) {
+        return [];
+    }
+}
+
+function setCart(ids) {
+    if (ids.length) {
+        window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+    } else {
+        window.localStorage.removeItem(CART_KEY);
+    }
+}
+
+// region Login page
+function showLoginError(text) {
+    var container = document.getElementById("error-container");
+    container.innerHTML = "";
+    var header = document.createElement("h3");
+    header.setAttribute("data-test", "error");
+    header.textContent = text;
+    container.appendChild(header);
+}
+
+function submitLogin(event) {
+    event.preventDefault();
+    var username = document.getElementById("user-name").value;
+    var pwd = document.getElementById("password").value;
+
+    if (!username) {
+        return showLoginError("Epic sadface: Username is required");
+    }
+    if (!pwd) {
+        return showLoginError("Epic sadface: Password is required");
+    }
+    if (USERS[username] !== pwd) {
+        return showLoginError("Epic sadface: Username and password do not match any user in this service");
+    }
+    if (username === "locked_out_user") {
+        return showLoginError("Epic sadface: Sorry, this user has been locked out.");
+    }
+    document.cookie = SESSION_COOKIE + "=" + encodeURIComponent(username) + "; path=/";
+    window.location.href = "inventory.html";
+}
+
+function initLogin() {
+    document.getElementById("login_form").addEventListener("submit", submitLogin);
+}
+// endregion
+
+// region Inventory page
+function renderBadge() {
+    var link = document.getElementById("shopping_cart_link");
+    var badge = link.querySelector("[data-test='shopping-cart-badge']");
+    var count = getCart().length;
+    if (!count) {
+        if (badge) {
+            link.removeChild(badge);
+        }
+        return;
+    }
+    if (!badge) {
+        badge = document.createElement("span");
+        badge.className = "shopping_cart_badge";
+        badge.setAttribute("data-test", "shopping-cart-badge");
+        link.appendChild(badge);
+    }
+    badge.textContent = String(count);
+}
+
+function renderInventory() {
+    var list = document.getElementById("inventory_list");
+    var cart = getCart();
+    list.innerHTML = "";
+    PRODUCTS.forEach(function (product) {
+        var inCart = cart.indexOf(product.id) !== -1;
+        var item = document.createElement("div");
+        item.className = "inventory_item";
+
+        var name = document.createElement("div");
+        name.className = "inventory_item_name";
+        name.textContent = product.name;
+        item.appendChild(name);
+
+        var btn = document.createElement("button");
+        btn.id = (inCart ? "remove-" : "add-to-cart-") + slug(product.name);
+        btn.setAttribute("data-test", btn.id);
+        btn.textContent = inCart ? "Remove" : "Add to cart";
+        btn.addEventListener("click", function () {
+            var current = getCart();
+            var idx = current.indexOf(product.id);
+            if (idx === -1) {
+                current.push(product.id);
+            } else {
+                current.splice(idx, 1);
+            }
+            setCart(current);
+            renderInventory();
+        });
+        item.appendChild(btn);
+        list.appendChild(item);
+    });
+    renderBadge();
+}
+
+function initInventory() {
+    if (!getSession()) {
+        window.location.href = "/";
+        return;
+    }
+    document.getElementById("react-burger-menu-btn").addEventListener("click", function () {
+        document.getElementById("menu_wrap").style.display = "block";
+    });
+    document.addEventListener("keydown", function (event) {
+        if (event.key === "Escape") {
+            document.getElementById("menu_wrap").style.display = "none";
+        }
+    });
+    document.getElementById("logout_sidebar_link").addEventListener("click", function (event) {
+        event.preventDefault();
+        document.cookie = SESSION_COOKIE + "=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT";
+        window.location.href = "/";
+    });
+    renderInventory();
+}
+// endregion
@@ -0,0 +1,76 @@
+import allure
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+
+from benchmarks.bench import _StaleOnClick, compare, measure, summarize
+
+
+@allure.parent_suite("Framework")
+@allure.suite("Benchmarks")
+@allure.sub_suite("Reporting")
+class TestBench:
+
+    @pytest.mark.framework
+    @allure.title("Verify summary statistics of timing samples")
+    def test_summarize(self):
+        with allure.step("Summarize twenty samples of 1..20 ms."):
+            summary = summarize([n / 1000 for n in range(20, 0, -1)])
+
+        with allure.step("Verify the reported statistics."):
+            assert summary["rounds"] == 20
+            assert summary["median_ms"] == pytest.approx(10.5)
+            assert summary["mean_ms"] == pytest.approx(10.5)
+            assert summary["p95_ms"] == pytest.approx(19)
+            assert summary["min_ms"] == pytest.approx(1)
+
+        with allure.step("Verify a single sample is its own median, p95 and min."):
+            single = summarize([0.004])
+            assert single["median_ms"] == single["p95_ms"] == single["min_ms"] == pytest.approx(4)
+
+    @pytest.mark.framework
+    @allure.title("Verify measure() skips warm-up rounds and runs setup untimed before each round")
+    def test_measure(self):
+        calls = []
+        summary = measure(lambda: calls.append("fn"), rounds=3, setup=lambda: calls.append("setup"), warmup=2)
+
+        assert summary["rounds"] == 3
+        assert calls == ["setup", "fn"] * 5, f"Unexpected call order: {calls}"
+
+    @pytest.mark.framework
+    @allure.title("Verify compare() flags regressions beyond the threshold only")
+    def test_compare(self, capsys):
+        baseline = {"go_to": {"median_ms": 100.0}, "click": {"median_ms": 10.0}, "gone": {"median_ms": 5.0}}
+
+        with allure.step("Compare results within the threshold."):
+            current = {"go_to": {"median_ms": 109.0}, "click": {"median_ms": 8.0}, "added": {"median_ms": 1.0}}
+            assert compare(current, baseline, 0.10) is False
+
+        with allure.step("Verify new and missing benchmarks are reported but not flagged."):
+            table = capsys.readouterr().out
+            assert "REGRESSION" not in table
+            assert any(line.startswith("added") and line.endswith("new") for line in table.splitlines())
+            assert any(line.startswith("gone") and line.endswith("missing") for line in table.splitlines())
+
+        with allure.step("Compare results with one median beyond the threshold."):
+            current = {"go_to": {"median_ms": 111.0}, "click": {"median_ms": 10.0}}
+            assert compare(current, baseline, 0.10) is True
+            table = capsys.readouterr().out
+            assert any(line.startswith("go_to") and line.endswith("REGRESSION") for line in table.splitlines())
+
+    @pytest.mark.framework
+    @allure.title("Verify the injected stale click leaves the real element untouched")
+    def test_stale_on_click(self):
+        class _Element:
+            text = "Open Menu"
+            clicked = 0
+
+            def click(self):
+                self.clicked += 1
+
+        elem = _Element()
+        wrapped = _StaleOnClick(elem)
+
+        with pytest.raises(StaleElementReferenceException):
+            wrapped.click()
+        assert elem.clicked == 0
+        assert wrapped.text == "Open Menu"
@@ -0,0 +1,20 @@
+import pytest
+
+from pages.cart_page import Cart
+from pages.login_page import LoginPage
+
+
+@pytest.fixture
+def seed_cart(driver, base_url):
+    """Returns a callable that logs in and seeds the cart through client-side storage (one reload, any cart size)."""
+    login_page = LoginPage(driver)
+    cart = Cart(driver)
+
+    def _seed(ids, credentials=("standard_user", "secret_sauce")):
+        login_page._go_to(base_url)
+        login_page._execute_login(*credentials)
+        login_page._wait_until_redirected_to(base_url.rstrip("/") + "/inventory.html")
+        cart._seed_cart(ids)
+        assert cart._is_seeded_cart_consistent(ids), (f"Seeded cart {cart._get_cart_storage()} "
+                                                      f"does not match {list(ids)}")
+    return _seed
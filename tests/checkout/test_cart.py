@@ -62,3 +62,23 @@ class TestCartFunc:
 
         with allure.step("Verify that cart badge count is correct."):
             assert not self.cart._is_badge_count_visible(), f"Badge count should not visible."
+
+    @pytest.mark.checkout
+    @pytest.mark.regression
+    @allure.title("Verify removing a product from a full cart")
+    def test_decreasing_full_cart_badge_count(self, driver, base_url, seed_cart):
+        with allure.step("Login user and seed cart with all products."):
+            seed_cart(Cart.product_ids)
+
+        with allure.step("Verify that cart badge count is correct."):
+            badge_count = self.cart._get_cart_badge_count()
+            expected = len(Cart.product_ids)
+            assert badge_count == expected, f"Expected badge count is {expected}, but got {badge_count}"
+
+        with allure.step("Remove first product from cart."):
+            self.inventory_page._click_remove_btn(1)
+
+        with allure.step("Verify that cart badge count is correct."):
+            badge_count = self.cart._get_cart_badge_count()
+            expected = len(Cart.product_ids) - 1
+            assert badge_count == expected, f"Expected badge count is {expected}, but got {badge_count}"
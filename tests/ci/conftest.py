@@ -0,0 +1,24 @@
+import os
+import textwrap
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def repo_pytester(pytester, monkeypatch):
+    """pytester whose throwaway suites load this repo's root conftest (options, browser fixtures, plugins)."""
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [ROOT_DIR, os.environ.get("PYTHONPATH")])))
+    pytester.makeconftest(textwrap.dedent(f"""
+        import importlib.util
+        import sys
+
+        _spec = importlib.util.spec_from_file_location("repo_conftest", {os.path.join(ROOT_DIR, "conftest.py")!r})
+        _module = importlib.util.module_from_spec(_spec)
+        sys.modules["repo_conftest"] = _module
+        _spec.loader.exec_module(_module)
+
+        pytest_plugins = ["repo_conftest"]
+    """))
+    return pytester
@@ -0,0 +1,78 @@
+import json
+
+import allure
+import pytest
+
+SUITE = """
+    import pathlib
+
+    import pytest
+
+
+    def test_pass():
+        pass
+
+
+    def test_flaky():
+        ran = pathlib.Path("flaky-ran")
+        if not ran.exists():
+            ran.write_text("1")
+            assert False, "first attempt fails"
+
+
+    @pytest.mark.skip(reason="not run")
+    def test_skip():
+        pass
+"""
+
+
+@allure.parent_suite("Framework")
+@allure.suite("CI scripts")
+@allure.sub_suite("Results stream")
+class TestResultsStream:
+
+    @pytest.mark.framework
+    @pytest.mark.parametrize("xdist", [False, True], ids=["serial", "xdist"])
+    @allure.title("Verify the results stream logs one finish per attempt, reruns and the xdist worker")
+    def test_event_sequence(self, repo_pytester, xdist):
+        repo_pytester.makepyfile(test_suite=SUITE)
+        args = ["-p", "no:cacheprovider", "--results-stream=stream.ndjson", "--reruns", "1"]
+        if xdist:
+            args += ["-n", "2"]
+
+        with allure.step("Run a suite with a passing, a flaky and a skipped test."):
+            result = repo_pytester.runpytest_subprocess(*args)
+            result.assert_outcomes(passed=2, skipped=1)
+            assert result.parseoutcomes().get("rerun") == 1
+
+        with allure.step("Read the stream."):
+            lines = (repo_pytester.path / "stream.ndjson").read_text().splitlines()
+            events = [json.loads(line) for line in lines]
+
+        with allure.step("Verify the session events frame the run."):
+            assert events[0]["ev"] == "session_start"
+            assert events[-1] == {"ev": "session_finish", "exit": 0, "t": events[-1]["t"]}
+            assert [e["ev"] for e in events].count("session_finish") == 1
+
+        with allure.step("Verify one start and one finish per attempt, in that order."):
+            finishes = {}
+            for nodeid in ("test_suite.py::test_pass", "test_suite.py::test_flaky", "test_suite.py::test_skip"):
+                own = [e for e in events if e.get("id") == nodeid]
+                attempts = 2 if nodeid.endswith("flaky") else 1
+                assert [e["ev"] for e in own] == ["start", "finish"] * attempts, f"{nodeid}: {own}"
+                finishes[nodeid] = [e["outcome"] for e in own if e["ev"] == "finish"]
+
+        with allure.step("Verify the outcomes, with rerun on the retried attempt."):
+            assert finishes == {
+                "test_suite.py::test_pass": ["passed"],
+                "test_suite.py::test_flaky": ["rerun", "passed"],
+                "test_suite.py::test_skip": ["skipped"],
+            }
+
+        with allure.step("Verify the worker id is set only under xdist."):
+            workers = {e["w"] for e in events if e["ev"] == "finish"}
+            if xdist:
+                assert workers and workers <= {"gw0", "gw1"}, f"Workers: {workers}"
+            else:
+                assert workers == {None}
+            assert all("w" not in e for e in events if e["ev"] == "start")
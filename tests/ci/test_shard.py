@@ -0,0 +1,139 @@
+import os
+import sys
+
+import allure
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT_DIR, ".github", "scripts"))
+
+from shard import (assign_groups_balanced, browser_of_nodeid, group_nodeids,  # noqa: E402
+                   interleave_by_browser)
+
+BROWSERS = ["chrome", "firefox"]
+
+
+def _nodeids() -> list:
+    # collection order of a two-browser run: the browser variants of a test sit next to each other
+    tests = ([f"tests/a/test_a.py::TestA::test_{i}" for i in range(5)]
+             + [f"tests/b/test_b.py::TestB::test_{i}" for i in range(2)]
+             + ["tests/c/test_c.py::TestC::test_0"])
+    nodeids = [f"{t}[{b}]" for t in tests for b in BROWSERS]
+    # tests that do not use the driver are not parametrized by browser
+    return nodeids + ["tests/ci/test_x.py::TestX::test_0", "tests/ci/test_x.py::TestX::test_1"]
+
+
+def _partition(nodeids, shard_count, by):
+    # every shard computes the whole assignment independently and keeps its own slice
+    groups = group_nodeids(nodeids, by=by, browsers=BROWSERS)
+    return [assign_groups_balanced(groups, shard_count, BROWSERS)[si] for si in range(shard_count)]
+
+
+def _count(shard, browser):
+    return sum(1 for nid in shard if browser_of_nodeid(nid, BROWSERS) == browser)
+
+
+@allure.parent_suite("Framework")
+@allure.suite("CI scripts")
+@allure.sub_suite("Sharding")
+class TestShard:
+
+    @pytest.mark.framework
+    @allure.title("Verify the browser of a nodeid is read from its parameters")
+    def test_browser_of_nodeid(self):
+        assert browser_of_nodeid("tests/a.py::T::test[firefox]", BROWSERS) == "firefox"
+        assert browser_of_nodeid("tests/a.py::T::test[2-chrome]", BROWSERS) == "chrome"
+        assert browser_of_nodeid("tests/a.py::T::test[edge]", BROWSERS) is None
+        assert browser_of_nodeid("tests/a.py::T::test", BROWSERS) is None
+
+    @pytest.mark.framework
+    @allure.title("Verify module groups are split per browser")
+    def test_groups_split_per_browser(self):
+        groups = group_nodeids(_nodeids(), by="module", browsers=BROWSERS)
+
+        assert len(groups) == 7, f"Expected 3 modules x 2 browsers + 1 unparametrized module, got {groups}"
+        for group in groups:
+            assert len({browser_of_nodeid(nid, BROWSERS) for nid in group}) == 1, f"Mixed browsers in {group}"
+
+    @pytest.mark.framework
+    @pytest.mark.parametrize("shard_count", [2, 3])
+    @allure.title("Verify browser x test pairs are balanced within one test per shard")
+    def test_balanced_per_test(self, shard_count):
+        nodeids = _nodeids()
+        shards = _partition(nodeids, shard_count, by="none")
+
+        with allure.step("Verify that every nodeid runs on exactly one shard."):
+            assert sorted(nid for shard in shards for nid in shard) == sorted(nodeids)
+
+        with allure.step("Verify that shard sizes and per-browser counts differ by at most one."):
+            sizes = [len(shard) for shard in shards]
+            assert max(sizes) - min(sizes) <= 1, f"Shard sizes {sizes}"
+            for browser in BROWSERS + [None]:
+                counts = [_count(shard, browser) for shard in shards]
+                assert max(counts) - min(counts) <= 1, f"{browser} counts {counts}"
+
+    @pytest.mark.framework
+    @allure.title("Verify module groups are balanced within the largest group per shard")
+    def test_balanced_per_module(self):
+        nodeids = _nodeids()
+        shards = _partition(nodeids, 2, by="module")
+
+        assert sorted(nid for shard in shards for nid in shard) == sorted(nodeids)
+        sizes = [len(shard) for shard in shards]
+        assert max(sizes) - min(sizes) <= 5, f"Shard sizes {sizes}"
+        for browser in BROWSERS:
+            assert all(_count(shard, browser) for shard in shards), f"A shard got no {browser} tests: {shards}"
+
+    @pytest.mark.framework
+    @allure.title("Verify every shard computes the same partition")
+    def test_partition_is_deterministic(self):
+        assert _partition(_nodeids(), 3, by="module") == _partition(list(_nodeids()), 3, by="module")
+
+    @pytest.mark.framework
+    @allure.title("Verify tests without a browser are kept and interleaved with the browsers")
+    def test_interleave_keeps_unparametrized(self):
+        shard = ["a[chrome]", "b[chrome]", "c[chrome]", "a[firefox]", "x", "y"]
+
+        assert interleave_by_browser(shard, BROWSERS) == ["a[chrome]", "a[firefox]", "x", "b[chrome]", "y", "c[chrome]"]
+
+
+@allure.parent_suite("Framework")
+@allure.suite("CI scripts")
+@allure.sub_suite("Browser matrix")
+class TestBrowserMatrix:
+
+    @pytest.fixture
+    def suite(self, repo_pytester):
+        repo_pytester.makepyfile(test_matrix="""
+            def test_with_driver(browser):
+                pass
+
+            def test_without_driver():
+                pass
+        """)
+        return repo_pytester
+
+    @pytest.mark.framework
+    @allure.title("Verify --browser with several browsers parametrizes driver tests per browser")
+    def test_multi_browser_ids(self, suite):
+        result = suite.runpytest("--collect-only", "-q", "--browser", "chrome,firefox")
+
+        result.stdout.fnmatch_lines(["test_matrix.py::test_with_driver[[]chrome[]]",
+                                     "test_matrix.py::test_with_driver[[]firefox[]]",
+                                     "test_matrix.py::test_without_driver"])
+
+    @pytest.mark.framework
+    @allure.title("Verify a single browser keeps the unparametrized nodeids")
+    def test_single_browser_ids(self, suite):
+        result = suite.runpytest("--collect-only", "-q", "--browser", "firefox")
+
+        result.stdout.fnmatch_lines(["test_matrix.py::test_with_driver", "test_matrix.py::test_without_driver"])
+        result.stdout.no_fnmatch_line("*[[]*")
+
+    @pytest.mark.framework
+    @allure.title("Verify an empty --browser is rejected as a usage error")
+    def test_empty_browser_rejected(self, suite):
+        result = suite.runpytest("--collect-only", "--browser", " , ")
+
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(["*--browser needs at least one browser*"])
@@ -0,0 +1,95 @@
+import json
+import os
+import sys
+
+import allure
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT_DIR, ".github", "scripts"))
+
+from stream_merge import IncrementalAllureMerge, LiveSummary, StreamTail  # noqa: E402
+
+
+def _line(**event) -> bytes:
+    return (json.dumps(event) + "\n").encode("utf-8")
+
+
+@allure.parent_suite("Framework")
+@allure.suite("CI scripts")
+@allure.sub_suite("Stream merge")
+class TestStreamMerge:
+
+    @pytest.mark.framework
+    @allure.title("Verify the stream tail keeps a partially written line for the next poll")
+    def test_stream_tail_partial_lines(self, tmp_path):
+        path = tmp_path / "results-stream-0.ndjson"
+        tail = StreamTail(str(path))
+
+        with allure.step("Poll a stream that does not exist yet."):
+            assert tail.read_events() == []
+
+        with allure.step("Write one full line and half of the next."):
+            second = _line(ev="start", id="t::b")
+            path.write_bytes(_line(ev="start", id="t::a") + second[:10])
+            assert [e["id"] for e in tail.read_events()] == ["t::a"]
+            assert tail.offset == len(_line(ev="start", id="t::a"))
+
+        with allure.step("Complete the line and append a malformed one."):
+            with open(path, "ab") as fh:
+                fh.write(second[10:] + b"{not json\n" + _line(ev="finish", id="t::a", outcome="passed"))
+            assert [e["ev"] for e in tail.read_events()] == ["start", "finish"]
+
+        with allure.step("Verify nothing is read twice."):
+            assert tail.read_events() == []
+            assert tail.offset == path.stat().st_size
+
+    @pytest.mark.framework
+    @allure.title("Verify results are keyed by shard and nodeid")
+    def test_live_summary_keys_by_shard(self, tmp_path):
+        summary = LiveSummary()
+        shards = [StreamTail(str(tmp_path / f"results-stream-{i}.ndjson")) for i in range(2)]
+        for i, stream in enumerate(shards):
+            summary.apply(stream, {"ev": "session_start", "shard": str(i)})
+
+        with allure.step("Fail the same test on both shards, then pass it on a rerun on shard 0."):
+            assert summary.apply(shards[0], {"ev": "finish", "id": "t::a", "outcome": "failed"}) == ("0", "t::a")
+            assert summary.apply(shards[1], {"ev": "finish", "id": "t::a", "outcome": "failed"}) == ("1", "t::a")
+            assert summary.apply(shards[0], {"ev": "finish", "id": "t::a", "outcome": "failed"}) is None
+            summary.apply(shards[0], {"ev": "finish", "id": "t::a", "outcome": "passed"})
+            summary.apply(shards[1], {"ev": "start", "id": "t::b"})
+
+        with allure.step("Verify each shard keeps its own result."):
+            state = summary.to_dict(shards)
+            assert state["counts"] == {"passed": 1, "failed": 1}
+            assert state["failed"] == [{"shard": "1", "id": "t::a"}]
+            assert state["running"] == [{"shard": "1", "id": "t::b"}]
+            assert summary.failed_seen == [("0", "t::a"), ("1", "t::a")]
+
+    @pytest.mark.framework
+    @allure.title("Verify Allure files are copied once their size is stable, and the rest on the final pass")
+    def test_incremental_allure_merge(self, tmp_path):
+        results = tmp_path / "artifacts" / "allure-results-shard-0"
+        results.mkdir(parents=True)
+        merged = tmp_path / "merged-allure-results"
+        merger = IncrementalAllureMerge(str(tmp_path / "artifacts"), str(merged))
+
+        with allure.step("Write a finished result and a file that is still growing."):
+            (results / "a-result.json").write_text('{"name": "a"}')
+            (results / "b-result.json").write_text('{"na')
+            assert merger.poll() == 0, "Files seen for the first time must not be copied"
+
+        with allure.step("Poll again while the second file keeps growing."):
+            (results / "b-result.json").write_text('{"name": "b"')
+            assert merger.poll() == 1
+            assert sorted(os.listdir(merged)) == ["a-result.json"]
+
+        with allure.step("Poll again without changes."):
+            assert merger.poll() == 1
+            assert merger.poll() == 0, "Copied files must not be copied again"
+
+        with allure.step("Verify the final pass copies whatever is left, regardless of stability."):
+            (results / "c-result.json").write_text('{"name": "c"}')
+            assert merger.poll(final=True) == 1
+            assert sorted(os.listdir(merged)) == ["a-result.json", "b-result.json", "c-result.json"]
+            assert (merged / "b-result.json").read_text() == '{"name": "b"'
@@ -0,0 +1,37 @@
+import allure
+import pytest
+
+from loadgen import run_load
+from standin.server import start_server
+
+
+@allure.parent_suite("Swag Labs Website")
+@allure.suite("Load")
+@allure.sub_suite("Load generation")
+class TestLoadGen:
+
+    @pytest.fixture(scope="class")
+    def standin_url(self):
+        server, url = start_server()
+        yield url
+        server.shutdown()
+
+    @pytest.mark.load
+    @allure.title("Verify load run reports per-step latency for concurrent users")
+    def test_cart_flow_against_standin(self, browser, standin_url):
+        with allure.step("Run cart flow with 2 users for 2 iterations each."):
+            report = run_load("cart", standin_url, users=2, browser=browser, ramp_up=1, iterations=2)
+
+        with allure.step("Verify that all iterations passed."):
+            assert not report["startup_errors"], f"Driver startup failed: {report['startup_errors']}"
+            assert report["iterations_completed"] == 4, f"Expected 4 iterations, got {report}"
+            assert report["iterations_failed"] == 0, f"Expected no failed iterations, got {report}"
+
+        with allure.step("Verify that every step block was timed separately."):
+            titles = [s["step"] for s in report["steps"]]
+            assert titles == ["Login user", "Add first product to cart.", "Verify that cart badge count is correct.",
+                              "Remove the same product from cart.", "Verify that cart badge count is correct."], \
+                f"Unexpected step rows: {titles}"
+            for s in report["steps"]:
+                assert s["count"] == 4, f"Expected 4 samples for step {s['ordinal']} '{s['step']}', got {s['count']}"
+                assert s["p50_ms"] <= s["p95_ms"] <= s["p99_ms"], f"Percentiles out of order for {s['step']}"
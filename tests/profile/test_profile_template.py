@@ -0,0 +1,115 @@
+import os
+import shutil
+
+import allure
+import pytest
+
+import drivers
+import profile_template
+from profile_template import TEMPLATE_MARKER, clone_template, template_dir_for
+
+
+def _make_template(root) -> str:
+    """Fake chrome template as build_template leaves it, plus process state a crashed build could leave behind."""
+    template = root / "chrome"
+    (template / "Default" / "Cache").mkdir(parents=True)
+    (template / "Local State").write_text("{}")
+    (template / "First Run").write_text("")
+    (template / "Default" / "Preferences").write_text('{"profile": {}}')
+    (template / "Default" / "Cache" / "data_0").write_bytes(b"x" * 16)
+    (template / TEMPLATE_MARKER).write_text("")
+    (template / "lockfile").write_text("")
+    os.symlink("host-12345", template / "SingletonLock")
+    os.symlink(template / "Default", template / "Default" / "loop")
+    return str(template)
+
+
+def _listing(path) -> set:
+    return {os.path.relpath(os.path.join(root, name), path)
+            for root, dirs, filenames in os.walk(path) for name in dirs + filenames}
+
+
+@allure.parent_suite("Framework")
+@allure.suite("Drivers")
+@allure.sub_suite("Profile template")
+class TestProfileTemplate:
+
+    EXPECTED = {"Local State", "First Run", "Default", os.path.join("Default", "Preferences"),
+                os.path.join("Default", "Cache"), os.path.join("Default", "Cache", "data_0")}
+
+    @pytest.fixture
+    def clones(self):
+        made = []
+        yield made
+        for path in made:
+            shutil.rmtree(path, ignore_errors=True)
+
+    @pytest.mark.framework
+    @pytest.mark.parametrize("gnu_cp", [True, False], ids=["cp", "copytree"])
+    @allure.title("Verify a clone drops lock files, symlinks and the ready marker")
+    def test_clone_template(self, tmp_path, monkeypatch, clones, gnu_cp):
+        template = _make_template(tmp_path)
+        if not gnu_cp:
+            def no_cp(*args, **kwargs):
+                raise OSError("cp not found")
+            monkeypatch.setattr(profile_template.subprocess, "run", no_cp)
+
+        with allure.step("Clone the template."):
+            clone = clone_template(template)
+            clones.append(clone)
+
+        with allure.step("Verify the clone holds the profile and nothing process-specific."):
+            assert _listing(clone) == self.EXPECTED
+            assert (tmp_path / "chrome" / "Default" / "Preferences").read_text() == \
+                open(os.path.join(clone, "Default", "Preferences")).read()
+
+        with allure.step("Verify the template itself is untouched."):
+            assert os.path.isfile(os.path.join(template, TEMPLATE_MARKER))
+            assert os.path.islink(os.path.join(template, "SingletonLock"))
+
+    @pytest.mark.framework
+    @pytest.mark.parametrize("budget, cached", [(1024, True), (8, False)], ids=["cache-fits", "cache-too-big"])
+    @allure.title("Verify a built profile is pruned to the startup files and a bounded cache")
+    def test_prune_template(self, tmp_path, budget, cached):
+        template = tmp_path / "chrome"
+        (template / "Default" / "History").parent.mkdir(parents=True)
+        (template / "Default" / "History").write_bytes(b"h" * 64)
+        (template / "GrShaderCache").mkdir()
+        (template / "GrShaderCache" / "data").write_bytes(b"g" * 64)
+        (template / "Local State").write_text("{}")
+        (template / "Default" / "Preferences").write_text("{}")
+        (template / "Default" / "Cache").mkdir()
+        (template / "Default" / "Cache" / "data_0").write_bytes(b"c" * 16)
+
+        profile_template._prune_template(str(template), budget)
+
+        expected = {"Local State", "Default", os.path.join("Default", "Preferences")}
+        if cached:
+            expected |= {os.path.join("Default", "Cache"), os.path.join("Default", "Cache", "data_0")}
+        assert _listing(template) == expected
+        assert not os.path.exists(str(template) + ".prune")
+
+    @pytest.mark.framework
+    @allure.title("Verify drivers clone the template only for Chrome/Edge with a ready template")
+    def test_clone_profile_template_selection(self, tmp_path, monkeypatch, clones):
+        _make_template(tmp_path)
+        monkeypatch.setenv("BROWSER_PROFILE_TEMPLATE", str(tmp_path))
+
+        with allure.step("Verify Firefox and a browser without a template get no clone."):
+            assert drivers._clone_profile_template("firefox") is None
+            assert not os.path.exists(template_dir_for(str(tmp_path), "edge"))
+            assert drivers._clone_profile_template("edge") is None
+
+        with allure.step("Verify a template that was never marked ready is ignored."):
+            os.remove(tmp_path / "chrome" / TEMPLATE_MARKER)
+            assert drivers._clone_profile_template("chrome") is None
+
+        with allure.step("Verify a ready Chrome template is cloned."):
+            (tmp_path / "chrome" / TEMPLATE_MARKER).write_text("")
+            clone = drivers._clone_profile_template("chrome")
+            clones.append(clone)
+            assert clone and os.path.isfile(os.path.join(clone, "Default", "Preferences"))
+
+        with allure.step("Verify nothing is cloned without BROWSER_PROFILE_TEMPLATE."):
+            monkeypatch.delenv("BROWSER_PROFILE_TEMPLATE")
+            assert drivers._clone_profile_template("chrome") is None
@@ -0,0 +1,179 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import allure
+import pytest
+
+import drivers
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _FakeGridHandler(BaseHTTPRequestHandler):
+    """Just enough of the W3C protocol and Grid /status for build_driver()/quit()."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, value):
+        body = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _track(self):
+        self.server.client_ports.add(self.client_address[1])
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+
+    def do_GET(self):
+        self._track()
+        if self.path == "/status":
+            return self._send({"ready": True, "nodes": [{"slots": [{}] * self.server.slots}]})
+        self._send(None)
+
+    def do_POST(self):
+        self._track()
+        if self.path == "/session":
+            # stands in for time spent in the grid's new-session queue
+            time.sleep(self.server.new_session_delay)
+            return self._send({"sessionId": uuid.uuid4().hex, "capabilities": {"browserName": "chrome"}})
+        self._send(None)
+
+    def do_DELETE(self):
+        self._track()
+        self._send(None)
+
+
+@allure.parent_suite("Framework")
+@allure.suite("Drivers")
+@allure.sub_suite("Remote backend")
+class TestRemoteBackend:
+
+    @pytest.fixture
+    def fake_grid(self, monkeypatch, tmp_path):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeGridHandler)
+        server.daemon_threads = True
+        server.slots = 1
+        server.new_session_delay = 0.0
+        server.client_ports = set()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        monkeypatch.setenv("SELENIUM_REMOTE_URL", url)
+        monkeypatch.setenv("SELENIUM_REMOTE_SLOT_DIR", str(tmp_path / "slots"))
+        monkeypatch.setenv("SELENIUM_REMOTE_RETRY_DELAY", "0")
+        drivers.close_remote_connections()
+        yield server, url
+        drivers.close_remote_connections()
+        server.shutdown()
+
+    @pytest.mark.remote
+    @allure.title("Verify sessions fail over to a live endpoint and reuse pooled connections")
+    def test_failover_and_connection_reuse(self, fake_grid, monkeypatch):
+        server, url = fake_grid
+        server.slots = 2
+        monkeypatch.setenv("SELENIUM_REMOTE_URL", f"http://127.0.0.1:1,{url}")
+
+        with allure.step("Create and quit three sessions."):
+            endpoints = []
+            for _ in range(3):
+                driver = drivers.build_driver("chrome", headless=True)
+                endpoints.append(driver.remote_endpoint)
+                driver.quit()
+
+        with allure.step("Verify that every session landed on the live endpoint."):
+            assert endpoints == [url] * 3, f"Unexpected endpoints: {endpoints}"
+
+        with allure.step("Verify that the sessions shared one keep-alive connection."):
+            # one connection from the /status probe (urllib) and one pooled WebDriver connection
+            assert len(server.client_ports) == 2, f"Expected 2 client connections, got {server.client_ports}"
+
+    @pytest.mark.remote
+    @allure.title("Verify queue wait includes time spent in the grid's new-session queue")
+    def test_queue_wait_includes_new_session_request(self, fake_grid):
+        server, _ = fake_grid
+        server.new_session_delay = 0.5
+
+        with allure.step("Create a session on a grid that delays new sessions."):
+            driver = drivers.build_driver("chrome", headless=True)
+            driver.quit()
+
+        with allure.step("Verify that the delay is reported as queue wait."):
+            assert driver.session_queue_wait >= 0.5, f"Queue wait was {driver.session_queue_wait:.2f}s"
+            assert driver.slot_wait < 0.5, f"Slot wait was {driver.slot_wait:.2f}s"
+
+    @pytest.mark.remote
+    @allure.title("Verify SELENIUM_REMOTE_RETRIES=0 still makes one attempt")
+    def test_zero_retries_makes_one_pass(self, fake_grid, monkeypatch):
+        _, url = fake_grid
+        monkeypatch.setenv("SELENIUM_REMOTE_RETRIES", "0")
+
+        with allure.step("Create a session with retries disabled."):
+            driver = drivers.build_driver("chrome", headless=True)
+            driver.quit()
+
+        with allure.step("Verify that the session was created."):
+            assert driver.remote_endpoint == url
+
+    @pytest.mark.remote
+    @allure.title("Verify the driver fixture records the session queue wait in the test report")
+    def test_queue_wait_recorded_in_report(self, fake_grid, driver, request):
+        with allure.step("Verify that the queue wait is a user property of the test."):
+            props = dict(request.node.user_properties)
+            assert props["session_queue_wait_s"] == round(driver.session_queue_wait, 3), f"Properties: {props}"
+            assert props["slot_wait_s"] <= props["session_queue_wait_s"]
+
+    @pytest.mark.remote
+    @allure.title("Verify grid capacity is shared across processes")
+    def test_capacity_limit_across_processes(self, fake_grid):
+        holder_code = (
+            "import sys, time, drivers\n"
+            "d = drivers.build_driver('chrome', headless=True)\n"
+            "print('ready', flush=True)\n"
+            "time.sleep(1.5)\n"
+            "d.quit()\n"
+        )
+
+        with allure.step("Hold the grid's only slot from another process."):
+            holder = subprocess.Popen([sys.executable, "-c", holder_code], cwd=ROOT_DIR, env=os.environ.copy(),
+                                      stdout=subprocess.PIPE, text=True)
+            assert holder.stdout.readline().strip() == "ready", "Slot holder process did not start a session"
+
+        with allure.step("Create a session from this process."):
+            driver = drivers.build_driver("chrome", headless=True)
+            driver.quit()
+            holder.wait(timeout=10)
+
+        with allure.step("Verify that this process waited for the slot to be released."):
+            assert driver.slot_wait >= 1.0, f"Expected to wait for the slot, waited {driver.slot_wait:.2f}s"
+            assert driver.session_queue_wait >= driver.slot_wait
+
+    @pytest.mark.remote
+    @pytest.mark.skipif(not os.environ.get("SELENIUM_STANDALONE_URL"),
+                        reason="Set SELENIUM_STANDALONE_URL to a running selenium standalone server")
+    @allure.title("Verify a session against a locally launched standalone server")
+    def test_against_standalone_server(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("SELENIUM_REMOTE_URL", os.environ["SELENIUM_STANDALONE_URL"])
+        monkeypatch.setenv("SELENIUM_REMOTE_SLOT_DIR", str(tmp_path / "slots"))
+        drivers.close_remote_connections()
+        try:
+            with allure.step("Create a remote session and open a page."):
+                driver = drivers.build_driver("chrome", headless=True)
+                try:
+                    driver.get("about:blank")
+                    assert driver.session_id
+                finally:
+                    driver.quit()
+        finally:
+            drivers.close_remote_connections()